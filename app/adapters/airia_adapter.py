@@ -11,10 +11,12 @@ Each action produces a workflow run ID and audit trail.
 from __future__ import annotations
 
 import json
-import uuid
+from collections import deque
 from datetime import datetime
+from secrets import token_hex
 from typing import Any
 
+from app.config import settings
 from app.models.schemas import TriageCase
 
 
@@ -22,8 +24,8 @@ from app.models.schemas import TriageCase
 # State tracking
 # ---------------------------------------------------------------------------
 _last_used: datetime | None = None
-_call_log: list[dict[str, Any]] = []
-_actions_created: list[dict[str, Any]] = []
+_call_log: deque[dict[str, Any]] = deque(maxlen=settings.adapter_log_max_entries)
+_actions_created: deque[dict[str, Any]] = deque(maxlen=settings.adapter_log_max_entries)
 
 
 # ---------------------------------------------------------------------------
@@ -36,26 +38,24 @@ def create_case_action(case: TriageCase) -> dict[str, Any]:
     Returns an action artifact with workflow ID and status.
     """
     global _last_used
-    _last_used = datetime.utcnow()
-
-    action = {
-        "action_id": f"ACT-{uuid.uuid4().hex[:8]}",
-        "action_type": "create_case",
-        "workflow": "investigation_triage",
-        "case_id": case.case_id,
-        "title": case.title,
-        "severity": case.severity.value,
-        "estimated_impact": case.estimated_impact,
-        "recommended_action": case.recommended_action,
-        "status": "created",
-        "created_at": datetime.utcnow().isoformat(),
-    }
-
-    action = _execute_workflow("create_case", action)
-
-    _actions_created.append(action)
-    _log_call("create_case_action", {"case_id": case.case_id, "action_id": action["action_id"]})
-    return action
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    _last_used = now
+
+    action = _base_action("create_case", "investigation_triage", "created", now_iso)
+    action.update(
+        case_id=case.case_id,
+        title=case.title,
+        severity=case.severity.value,
+        estimated_impact=case.estimated_impact,
+        recommended_action=case.recommended_action,
+    )
+
+    return _submit_action(
+        "create_case", action, now_iso,
+        log_action="create_case_action",
+        log_details={"case_id": case.case_id, "action_id": action["action_id"]},
+    )
 
 
 def create_alert_action(
@@ -66,25 +66,18 @@ def create_alert_action(
 ) -> dict[str, Any]:
     """Send an alert notification via Airia workflow."""
     global _last_used
-    _last_used = datetime.utcnow()
-
-    action = {
-        "action_id": f"ACT-{uuid.uuid4().hex[:8]}",
-        "action_type": "send_alert",
-        "workflow": "alert_notification",
-        "title": title,
-        "severity": severity,
-        "message": message,
-        "target": target,
-        "status": "sent",
-        "created_at": datetime.utcnow().isoformat(),
-    }
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    _last_used = now
 
-    action = _execute_workflow("send_alert", action)
+    action = _base_action("send_alert", "alert_notification", "sent", now_iso)
+    action.update(title=title, severity=severity, message=message, target=target)
 
-    _actions_created.append(action)
-    _log_call("create_alert_action", {"action_id": action["action_id"], "target": target})
-    return action
+    return _submit_action(
+        "send_alert", action, now_iso,
+        log_action="create_alert_action",
+        log_details={"action_id": action["action_id"], "target": target},
+    )
 
 
 def create_approval_task(
@@ -95,40 +88,72 @@ def create_approval_task(
 ) -> dict[str, Any]:
     """Create an approval task via Airia workflow."""
     global _last_used
-    _last_used = datetime.utcnow()
-
-    action = {
-        "action_id": f"ACT-{uuid.uuid4().hex[:8]}",
-        "action_type": "approval_task",
-        "workflow": "approval_routing",
-        "title": title,
-        "description": description,
-        "assignee": assignee,
-        "case_id": case_id,
-        "status": "pending_approval",
-        "created_at": datetime.utcnow().isoformat(),
-    }
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    _last_used = now
 
-    action = _execute_workflow("approval_task", action)
+    action = _base_action("approval_task", "approval_routing", "pending_approval", now_iso)
+    action.update(title=title, description=description, assignee=assignee, case_id=case_id)
 
-    _actions_created.append(action)
-    _log_call("create_approval_task", {"action_id": action["action_id"], "assignee": assignee})
-    return action
+    return _submit_action(
+        "approval_task", action, now_iso,
+        log_action="create_approval_task",
+        log_details={"action_id": action["action_id"], "assignee": assignee},
+    )
 
 
 # ---------------------------------------------------------------------------
 # Workflow execution
 # ---------------------------------------------------------------------------
 
-def _execute_workflow(workflow_type: str, action: dict[str, Any]) -> dict[str, Any]:
-    """Execute a workflow and produce audit trail."""
-    action["workflow_run_id"] = f"WF-{uuid.uuid4().hex[:8]}"
+# (step, status) pairs recorded in every workflow's audit trail
+_AUDIT_STEPS: tuple[tuple[str, str], ...] = (
+    ("validate_input", "passed"),
+    ("check_permissions", "passed"),
+    ("execute_action", "completed"),
+)
+
+
+def _base_action(action_type: str, workflow: str, status: str, now_iso: str) -> dict[str, Any]:
+    """Return the fields every action artifact carries."""
+    return {
+        "action_id": f"ACT-{token_hex(4)}",
+        "action_type": action_type,
+        "workflow": workflow,
+        "status": status,
+        "created_at": now_iso,
+    }
+
+
+def _submit_action(
+    workflow_type: str,
+    action: dict[str, Any],
+    now_iso: str,
+    log_action: str,
+    log_details: dict[str, Any],
+) -> dict[str, Any]:
+    """Run the workflow for a built action, then record and log it.
+
+    Shared tail of every create_* function so there is a single dispatch path.
+    """
+    action = _execute_workflow(workflow_type, action, now_iso)
+    _actions_created.append(action)
+    _log_call(log_action, log_details, ts=now_iso)
+    return action
+
+
+def _execute_workflow(workflow_type: str, action: dict[str, Any], now_iso: str | None = None) -> dict[str, Any]:
+    """Execute a workflow and produce audit trail.
+
+    ``now_iso`` lets the calling action share its timestamp with every audit step.
+    """
+    ts = now_iso or datetime.utcnow().isoformat()
+    action["workflow_run_id"] = f"WF-{token_hex(4)}"
     action["workflow_status"] = "completed"
     action["execution_time_ms"] = 120
     action["audit_trail"] = [
-        {"step": "validate_input", "status": "passed", "timestamp": datetime.utcnow().isoformat()},
-        {"step": "check_permissions", "status": "passed", "timestamp": datetime.utcnow().isoformat()},
-        {"step": "execute_action", "status": "completed", "timestamp": datetime.utcnow().isoformat()},
+        {"step": step, "status": status, "timestamp": ts}
+        for step, status in _AUDIT_STEPS
     ]
     return action
 
@@ -142,10 +167,10 @@ def get_actions() -> list[dict[str, Any]]:
     return list(_actions_created)
 
 
-def _log_call(action: str, details: dict[str, Any]) -> None:
+def _log_call(action: str, details: dict[str, Any], ts: str | None = None) -> None:
     _call_log.append({
         "action": action,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": ts or datetime.utcnow().isoformat(),
         "details": details,
     })
 
@@ -155,7 +180,7 @@ def get_call_log() -> list[dict[str, Any]]:
 
 
 def reset() -> None:
-    global _last_used, _call_log, _actions_created
+    global _last_used
     _last_used = None
-    _call_log = []
-    _actions_created = []
+    _call_log.clear()
+    _actions_created.clear()
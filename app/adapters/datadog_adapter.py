@@ -6,18 +6,21 @@ signal_events dataset to trigger autonomous investigation.
 
 from __future__ import annotations
 
-import json
+from collections import deque
 from datetime import datetime
 from typing import Any
 
-from app.models.schemas import SignalEvent, Severity
+import orjson
+
+from app.config import settings
+from app.models.schemas import SEVERITY_BY_VALUE, SignalEvent
 
 
 # ---------------------------------------------------------------------------
 # State tracking
 # ---------------------------------------------------------------------------
 _last_used: datetime | None = None
-_call_log: list[dict[str, Any]] = []
+_call_log: deque[dict[str, Any]] = deque(maxlen=settings.adapter_log_max_entries)
 
 
 # ---------------------------------------------------------------------------
@@ -34,12 +37,14 @@ def fetch_signals() -> list[SignalEvent]:
 def fetch_alert_context(signal: SignalEvent) -> dict[str, Any]:
     """Enrich a signal with additional context."""
     global _last_used
-    _last_used = datetime.utcnow()
+    now = datetime.utcnow()
+    now_iso = now.isoformat()
+    _last_used = now
 
     context = {
         "source": "datadog",
         "signal_id": signal.signal_id,
-        "enriched_at": datetime.utcnow().isoformat(),
+        "enriched_at": now_iso,
         "related_monitors": [
             {"monitor_id": "MON-001", "name": "Refund Rate Monitor", "status": "Alert"},
             {"monitor_id": "MON-002", "name": "Revenue Anomaly Detector", "status": "Warn"},
@@ -48,7 +53,7 @@ def fetch_alert_context(signal: SignalEvent) -> dict[str, Any]:
         "priority": "P2",
     }
 
-    _log_call("fetch_alert_context", context)
+    _log_call("fetch_alert_context", context, ts=now_iso)
     return context
 
 
@@ -58,32 +63,29 @@ def fetch_alert_context(signal: SignalEvent) -> dict[str, Any]:
 
 def _fetch_signals() -> list[SignalEvent]:
     """Read signals from DuckDB signal_events table where source='datadog'."""
-    from app.services.data_service import query_rows
+    from app.services.data_service import query_tuples
 
-    rows = query_rows("""
-        SELECT signal_id, timestamp, signal_type, severity, source,
-               related_entity, payload_json
+    rows = query_tuples("""
+        SELECT signal_id, timestamp, signal_type, severity, related_entity, payload_json
         FROM signal_events
         WHERE source = 'datadog'
         ORDER BY timestamp DESC
     """)
 
     signals = []
-    for r in rows:
-        payload = {}
-        if r.get("payload_json"):
-            try:
-                payload = json.loads(r["payload_json"]) if isinstance(r["payload_json"], str) else r["payload_json"]
-            except (json.JSONDecodeError, TypeError):
-                payload = {}
-
-        signals.append(SignalEvent(
-            signal_id=r["signal_id"],
-            timestamp=r["timestamp"],
-            signal_type=r["signal_type"],
-            severity=Severity(r["severity"]),
+    # Tuples unpack in SELECT order; an errored query yields no rows
+    for signal_id, ts, signal_type, severity, related_entity, raw in rows:
+        # payload_json is a JSON column, NULL when the payload was invalid at load
+        payload = orjson.loads(raw) if raw is not None else {}
+
+        # Rows come straight from our own table, so skip per-field validation
+        signals.append(SignalEvent.model_construct(
+            signal_id=signal_id,
+            timestamp=datetime.fromisoformat(str(ts)),
+            signal_type=signal_type,
+            severity=SEVERITY_BY_VALUE[severity],
             source="datadog",
-            related_entity=r["related_entity"],
+            related_entity=related_entity,
             payload=payload,
         ))
 
@@ -95,10 +97,10 @@ def _fetch_signals() -> list[SignalEvent]:
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _log_call(action: str, details: dict[str, Any]) -> None:
+def _log_call(action: str, details: dict[str, Any], ts: str | None = None) -> None:
     _call_log.append({
         "action": action,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": ts or datetime.utcnow().isoformat(),
         "details": details,
     })
 
@@ -108,6 +110,6 @@ def get_call_log() -> list[dict[str, Any]]:
 
 
 def reset() -> None:
-    global _last_used, _call_log
+    global _last_used
     _last_used = None
-    _call_log = []
+    _call_log.clear()
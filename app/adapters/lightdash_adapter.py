@@ -9,18 +9,26 @@ Provides the semantic metric context for OpsIQ:
 
 from __future__ import annotations
 
-import json
+import copy
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Any
 
+import orjson
+
+from app.config import settings
 from app.models.schemas import SignalEvent, Severity
 
 
 # ---------------------------------------------------------------------------
 # State tracking
 # ---------------------------------------------------------------------------
-_last_used: datetime | None = None
-_call_log: list[dict[str, Any]] = []
+# Epoch seconds from time.time(); formatted to ISO only when the log is read
+_last_used: float | None = None
+_call_log: deque[dict[str, Any]] = deque(maxlen=settings.adapter_log_max_entries)
 
 
 # ---------------------------------------------------------------------------
@@ -33,7 +41,7 @@ METRIC_DEFINITIONS: list[dict[str, Any]] = [
         "name": "monthly_revenue",
         "label": "Monthly Revenue",
         "description": "Total billed amount from paid invoices in the current month",
-        "sql": "SELECT sum(billed_amount) FROM invoices WHERE status = 'paid' AND invoice_date >= date_trunc('month', current_date)",
+        "sql": "SELECT sum(billed_amount) FROM invoices WHERE status = 'paid' AND invoice_date::timestamp >= date_trunc('month', current_date)",
         "type": "sum",
         "table": "invoices",
         "column": "billed_amount",
@@ -44,7 +52,7 @@ METRIC_DEFINITIONS: list[dict[str, Any]] = [
         "name": "total_refunds",
         "label": "Total Refunds",
         "description": "Sum of all refund amounts in the current month",
-        "sql": "SELECT sum(amount) FROM refunds WHERE refund_date >= date_trunc('month', current_date)",
+        "sql": "SELECT sum(amount) FROM refunds WHERE refund_date::timestamp >= date_trunc('month', current_date)",
         "type": "sum",
         "table": "refunds",
         "column": "amount",
@@ -100,31 +108,78 @@ METRIC_DEFINITIONS: list[dict[str, Any]] = [
     },
 ]
 
+# Name → definition index for O(1) lookups
+_METRIC_INDEX: dict[str, dict[str, Any]] = {m["name"]: m for m in METRIC_DEFINITIONS}
+
+# The definitions never change at runtime, so the HTTP layer can serve these bytes as-is
+_METRIC_DEFINITIONS_JSON: bytes = orjson.dumps(METRIC_DEFINITIONS)
+
+# Lowercased (name, table, description) per metric, built once for entity matching
+_METRIC_SEARCH_FIELDS: tuple[tuple[str, str, str, dict[str, Any]], ...] = tuple(
+    (
+        m.get("name", "").lower(),
+        m.get("table", "").lower(),
+        m.get("description", "").lower(),
+        {"name": m["name"], "label": m["label"], "description": m["description"]},
+    )
+    for m in METRIC_DEFINITIONS
+)
+
 
 def get_metric_definitions() -> list[dict[str, Any]]:
     """Return the semantic metric layer (Lightdash-compatible definitions)."""
     global _last_used
-    _last_used = datetime.utcnow()
+    _last_used = time.time()
     _log_call("get_metric_definitions", {"count": len(METRIC_DEFINITIONS)})
     return METRIC_DEFINITIONS
 
 
+def find_related_metrics(entity: str) -> list[dict[str, Any]]:
+    """Return metrics whose name, table or description contains ``entity`` (case-insensitive)."""
+    global _last_used
+    _last_used = time.time()
+    _log_call("find_related_metrics", {"entity": entity})
+    # An empty needle is a substring of everything; no entity means no relation
+    if not entity:
+        return []
+    needle = entity.lower()
+    return [
+        dict(summary)
+        for name, table, description, summary in _METRIC_SEARCH_FIELDS
+        if needle in name or needle in table or needle in description
+    ]
+
+
+def get_metric_definitions_json() -> bytes:
+    """Return the metric layer pre-serialized as JSON, for the metrics endpoint."""
+    global _last_used
+    _last_used = time.time()
+    _log_call("get_metric_definitions", {"count": len(METRIC_DEFINITIONS)})
+    return _METRIC_DEFINITIONS_JSON
+
+
 def get_metric_by_name(name: str) -> dict[str, Any] | None:
     """Look up a single metric definition by name."""
-    for m in METRIC_DEFINITIONS:
-        if m["name"] == name:
-            return m
-    return None
+    return _METRIC_INDEX.get(name)
 
 
 # ---------------------------------------------------------------------------
 # Chart Configuration
 # ---------------------------------------------------------------------------
 
+# Static part of every chart config, built once at import
+_CHART_COLORS: tuple[str, ...] = ("#4C78A8", "#F58518", "#E45756", "#72B7B2", "#54A24B")
+_CHART_BASE: dict[str, Any] = {
+    "showLegend": True,
+    "showGrid": True,
+    "colors": _CHART_COLORS,
+}
+
+
 def get_chart_config(metric_name: str, chart_type: str = "bar") -> dict[str, Any]:
     """Return a Lightdash-compatible chart configuration for a metric."""
     global _last_used
-    _last_used = datetime.utcnow()
+    _last_used = time.time()
 
     metric = get_metric_by_name(metric_name)
     config = {
@@ -133,12 +188,7 @@ def get_chart_config(metric_name: str, chart_type: str = "bar") -> dict[str, Any
         "chart_type": chart_type,
         "title": metric["label"] if metric else metric_name,
         "description": metric["description"] if metric else "",
-        "config": {
-            "type": chart_type,
-            "showLegend": True,
-            "showGrid": True,
-            "colors": ["#4C78A8", "#F58518", "#E45756", "#72B7B2", "#54A24B"],
-        },
+        "config": {"type": chart_type, **_CHART_BASE},
     }
     _log_call("get_chart_config", {"metric": metric_name, "chart_type": chart_type})
     return config
@@ -148,33 +198,31 @@ def get_chart_config(metric_name: str, chart_type: str = "bar") -> dict[str, Any
 # Signal Ingestion
 # ---------------------------------------------------------------------------
 
-def fetch_signals() -> list[SignalEvent]:
-    """Fetch metric drift signals from the signal_events dataset."""
+def fetch_signals(limit: int = 500) -> list[SignalEvent]:
+    """Fetch the most recent metric drift signals from the signal_events dataset."""
     global _last_used
-    _last_used = datetime.utcnow()
-    return _fetch_signals()
+    _last_used = time.time()
+    return _fetch_signals(limit)
 
 
-def _fetch_signals() -> list[SignalEvent]:
-    """Read signals from DuckDB signal_events table where source='lightdash'."""
+def _fetch_signals(limit: int = 500) -> list[SignalEvent]:
+    """Read the newest `limit` signals from DuckDB signal_events where source='lightdash'."""
     from app.services.data_service import query_rows
 
+    # ORDER BY + LIMIT lets DuckDB keep a top-N heap instead of sorting
     rows = query_rows("""
-        SELECT signal_id, timestamp, signal_type, severity, source,
+        SELECT signal_id, timestamp, signal_type, severity,
                related_entity, payload_json
         FROM signal_events
         WHERE source = 'lightdash'
         ORDER BY timestamp DESC
-    """)
+        LIMIT ?
+    """, [limit])
 
     signals = []
     for r in rows:
-        payload = {}
-        if r.get("payload_json"):
-            try:
-                payload = json.loads(r["payload_json"]) if isinstance(r["payload_json"], str) else r["payload_json"]
-            except (json.JSONDecodeError, TypeError):
-                payload = {}
+        raw = r.get("payload_json")
+        payload = orjson.loads(raw) if raw is not None else {}
 
         signals.append(SignalEvent(
             signal_id=r["signal_id"],
@@ -190,16 +238,60 @@ def _fetch_signals() -> list[SignalEvent]:
     return signals
 
 
+# Metric results are reused for a short window — the underlying tables only
+# change on reseed, and reset() drops the cache when that happens.
+_METRIC_CACHE_TTL_S = 10.0
+_metric_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+_metric_cache_lock = threading.Lock()
+# Queries currently running, so concurrent misses on one metric share a result
+_metric_inflight: dict[str, Future] = {}
+
+
 def query_metric(metric_name: str) -> dict[str, Any]:
-    """Query a specific metric value against local DuckDB."""
+    """Query a specific metric value against local DuckDB (TTL-cached).
+
+    Concurrent cache misses for the same metric wait on the first caller's
+    query instead of each running their own.
+    """
     global _last_used
-    _last_used = datetime.utcnow()
+    _last_used = time.time()
 
     metric = get_metric_by_name(metric_name)
     if not metric:
         return {"error": f"Unknown metric: {metric_name}"}
 
-    return _query_metric(metric)
+    now = time.monotonic()
+    with _metric_cache_lock:
+        cached = _metric_cache.get(metric_name)
+    if cached and cached[0] > now:
+        _log_call("query_metric", {"metric": metric_name, "cached": True})
+        return copy.deepcopy(cached[1])
+
+    with _metric_cache_lock:
+        inflight = _metric_inflight.get(metric_name)
+        if inflight is None:
+            future: Future = Future()
+            _metric_inflight[metric_name] = future
+    if inflight is not None:
+        result = copy.deepcopy(inflight.result())
+        _log_call("query_metric", {"metric": metric_name, "coalesced": True})
+        return result
+
+    try:
+        result = _query_metric(metric)
+        # Expiry counts from when the result arrived, not from the lookup
+        if result["source"] != "error":
+            with _metric_cache_lock:
+                _metric_cache[metric_name] = (time.monotonic() + _METRIC_CACHE_TTL_S, copy.deepcopy(result))
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _metric_cache_lock:
+            _metric_inflight.pop(metric_name, None)
 
 
 def _query_metric(metric: dict[str, Any]) -> dict[str, Any]:
@@ -233,16 +325,21 @@ def _query_metric(metric: dict[str, Any]) -> dict[str, Any]:
 def _log_call(action: str, details: dict[str, Any]) -> None:
     _call_log.append({
         "action": action,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": time.time(),
         "details": details,
     })
 
 
 def get_call_log() -> list[dict[str, Any]]:
-    return list(_call_log)
+    return [
+        {**entry, "timestamp": datetime.utcfromtimestamp(entry["timestamp"]).isoformat()}
+        for entry in _call_log
+    ]
 
 
 def reset() -> None:
-    global _last_used, _call_log
+    global _last_used
     _last_used = None
-    _call_log = []
+    _call_log.clear()
+    with _metric_cache_lock:
+        _metric_cache.clear()
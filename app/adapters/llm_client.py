@@ -20,21 +20,100 @@ Setup:
 
 from __future__ import annotations
 
+import atexit
+import functools
+import hashlib
+import random
+import threading
+import time
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+import orjson
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    import httpx
+
 
 # ---------------------------------------------------------------------------
 # State tracking
 # ---------------------------------------------------------------------------
 _last_used: datetime | None = None
 _call_count: int = 0
-_reasoning_log: list[dict[str, Any]] = []
+# Bounded ring buffer; entry timestamps are time.time() floats, formatted on read
+_reasoning_log: deque[dict[str, Any]] = deque(maxlen=settings.adapter_log_max_entries)
+
+
+# Exact-match response cache — identical prompts (same case evidence, same
+# question) are answered locally instead of re-sending them to the provider
+_TEMPERATURE = 0.3
+_CACHE_MAX = 1024
+_CACHE_TTL_S = 3600.0
+_response_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_hits: int = 0
+_cache_misses: int = 0
+
+# Shared HTTP client — keeps TCP+TLS connections to the provider alive between calls
+_client: httpx.Client | None = None
+
+
+def _get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        import httpx
+
+        _client = httpx.Client(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30.0),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+        )
+    return _client
+
+
+# Process-wide cap on in-flight provider requests, so bursts of agent calls
+# don't trip the provider's rate limit
+_request_slots = threading.BoundedSemaphore(settings.llm_max_concurrency)
+_retry_count: int = 0
+_retry_lock = threading.Lock()
+_MAX_BACKOFF_S = 10.0
+
+
+@atexit.register
+def _close_client() -> None:
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+
+# Cheap authenticated endpoint per provider, used only to open a connection early
+_WARMUP_URLS = {
+    "groq": "https://api.groq.com/openai/v1/models",
+    "openai": "https://api.openai.com/v1/models",
+}
+
+
+def warmup() -> None:
+    """Open a pooled connection to the provider so the first chat() skips the TLS handshake.
+
+    Best effort — the response and any error are ignored.
+    """
+    url = _WARMUP_URLS.get(get_provider())
+    if not is_available() or url is None:
+        return
+    api_key = settings.groq_api_key if get_provider() == "groq" else settings.openai_api_key
+    try:
+        _get_client().head(url, headers={"Authorization": f"Bearer {api_key}"}, timeout=5.0)
+    except Exception as e:
+        print(f"  [llm_client] Warmup skipped: {e}")
 
 
+@functools.cache
 def is_available() -> bool:
+    """Return whether an LLM key is configured (resolved once; reset() clears it)."""
     return settings.llm_available
 
 
@@ -42,11 +121,16 @@ def get_provider() -> str:
     return settings.llm_provider
 
 
-def get_model() -> str:
+@functools.cache
+def get_model(tier: str = "quality") -> str:
+    """Return the configured model name for a tier (resolved once; reset() clears it).
+
+    "quality" is the main model; "fast" is the smaller model used for display-only text.
+    """
     if settings.llm_provider == "groq":
-        return settings.groq_model
+        return settings.groq_fast_model if tier == "fast" else settings.groq_model
     elif settings.llm_provider == "openai":
-        return settings.openai_model
+        return settings.openai_fast_model if tier == "fast" else settings.openai_model
     return "none"
 
 
@@ -58,12 +142,21 @@ def get_status() -> dict[str, Any]:
         "call_count": _call_count,
         "last_used": _last_used.isoformat() if _last_used else None,
         "reasoning_steps": len(_reasoning_log),
+        "cache": cache_stats(),
+        "retries": _retry_count,
     }
 
 
+def cache_stats() -> dict[str, int]:
+    return {"hits": _cache_hits, "misses": _cache_misses, "size": len(_response_cache)}
+
+
 def get_reasoning_log() -> list[dict[str, Any]]:
     """Return the log of all LLM reasoning calls for observability."""
-    return list(_reasoning_log)
+    return [
+        {**entry, "timestamp": datetime.utcfromtimestamp(entry["timestamp"]).isoformat()}
+        for entry in _reasoning_log
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -104,13 +197,19 @@ def generate_follow_ups(question: str, answer: str) -> list[str]:
 # Generic chat — the core LLM call used by all agents
 # ---------------------------------------------------------------------------
 
-def chat(messages: list[dict[str, str]], max_tokens: int = 500, purpose: str = "") -> str:
+def chat(
+    messages: list[dict[str, str]],
+    max_tokens: int = 500,
+    purpose: str = "",
+    tier: str = "quality",
+) -> str:
     """Send a chat completion request to the configured LLM provider.
 
     Args:
         messages: OpenAI-format messages [{"role": ..., "content": ...}]
         max_tokens: Max response tokens
         purpose: Description of why this call is being made (for logging)
+        tier: "quality" for reasoning, "fast" for short display text (smaller model)
 
     Returns:
         LLM response text, or empty string on failure.
@@ -119,83 +218,175 @@ def chat(messages: list[dict[str, str]], max_tokens: int = 500, purpose: str = "
         return ""
 
     provider = get_provider()
+    key = _cache_key(provider, tier, messages, max_tokens)
+    cached = _cache_get(key)
+    if cached is not None:
+        # Hits show up in the reasoning log and cache_stats(); call_count stays
+        # a count of provider round-trips
+        _log_reasoning(purpose, messages, cached, "cache", get_model(tier))
+        return cached
+
     if provider == "groq":
-        return _call_groq(messages, max_tokens, purpose)
+        result = _call_groq(messages, max_tokens, purpose, tier)
     elif provider == "openai":
-        return _call_openai(messages, max_tokens, purpose)
-    return ""
-
+        result = _call_openai(messages, max_tokens, purpose, tier)
+    else:
+        return ""
 
-def _call_groq(messages: list[dict[str, str]], max_tokens: int = 500, purpose: str = "") -> str:
+    if result:
+        _cache_put(key, result)
+    return result
+
+
+def _cache_key(provider: str, tier: str, messages: list[dict[str, str]], max_tokens: int) -> str:
+    payload = orjson.dumps(
+        {
+            "provider": provider,
+            "model": get_model(tier),
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": _TEMPERATURE,
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _cache_get(key: str) -> str | None:
+    global _cache_hits, _cache_misses
+    with _cache_lock:
+        entry = _response_cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            _response_cache.move_to_end(key)
+            _cache_hits += 1
+            return entry[1]
+        if entry is not None:
+            del _response_cache[key]
+        _cache_misses += 1
+        return None
+
+
+def _cache_put(key: str, result: str) -> None:
+    with _cache_lock:
+        _response_cache[key] = (time.monotonic() + _CACHE_TTL_S, result)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _CACHE_MAX:
+            _response_cache.popitem(last=False)
+
+
+def _call_groq(
+    messages: list[dict[str, str]], max_tokens: int = 500, purpose: str = "", tier: str = "quality",
+) -> str:
     """Call Groq API (OpenAI-compatible). Free tier: Llama 3.3 70B."""
     global _last_used, _call_count
 
+    model = get_model(tier)
     try:
-        import httpx
-
-        resp = httpx.post(
+        resp = _post_with_retry(
             "https://api.groq.com/openai/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {settings.groq_api_key}",
                 "Content-Type": "application/json",
             },
-            json={
-                "model": settings.groq_model,
+            payload={
+                "model": model,
                 "messages": messages,
                 "max_tokens": max_tokens,
-                "temperature": 0.3,
+                "temperature": _TEMPERATURE,
             },
             timeout=30.0,
         )
-        resp.raise_for_status()
         _last_used = datetime.utcnow()
         _call_count += 1
-        result = resp.json()["choices"][0]["message"]["content"].strip()
-        _log_reasoning(purpose, messages, result, "groq")
+        result = orjson.loads(resp.content)["choices"][0]["message"]["content"].strip()
+        _log_reasoning(purpose, messages, result, "groq", model)
         return result
     except Exception as e:
         print(f"  [llm_client] Groq call failed: {e}")
         return ""
 
 
-def _call_openai(messages: list[dict[str, str]], max_tokens: int = 500, purpose: str = "") -> str:
+def _call_openai(
+    messages: list[dict[str, str]], max_tokens: int = 500, purpose: str = "", tier: str = "quality",
+) -> str:
     """Call OpenAI API. Fallback if Groq not configured."""
     global _last_used, _call_count
 
+    model = get_model(tier)
     try:
-        import httpx
-
-        resp = httpx.post(
+        resp = _post_with_retry(
             "https://api.openai.com/v1/chat/completions",
             headers={
                 "Authorization": f"Bearer {settings.openai_api_key}",
                 "Content-Type": "application/json",
             },
-            json={
-                "model": settings.openai_model,
+            payload={
+                "model": model,
                 "messages": messages,
                 "max_tokens": max_tokens,
-                "temperature": 0.3,
+                "temperature": _TEMPERATURE,
             },
             timeout=15.0,
         )
-        resp.raise_for_status()
         _last_used = datetime.utcnow()
         _call_count += 1
-        result = resp.json()["choices"][0]["message"]["content"].strip()
-        _log_reasoning(purpose, messages, result, "openai")
+        result = orjson.loads(resp.content)["choices"][0]["message"]["content"].strip()
+        _log_reasoning(purpose, messages, result, "openai", model)
         return result
     except Exception as e:
         print(f"  [llm_client] OpenAI call failed: {e}")
         return ""
 
 
-def _log_reasoning(purpose: str, messages: list[dict[str, str]], result: str, provider: str) -> None:
+def _post_with_retry(url: str, headers: dict[str, str], payload: dict[str, Any], timeout: float) -> httpx.Response:
+    """POST a chat request, retrying rate limits, 5xx and timeouts with backoff.
+
+    Honors Retry-After on 429. Raises once settings.llm_max_attempts is spent.
+    """
+    global _retry_count
+    import httpx
+
+    body = orjson.dumps(payload)
+    for attempt in range(settings.llm_max_attempts - 1):
+        try:
+            with _request_slots:
+                resp = _get_client().post(url, headers=headers, content=body, timeout=timeout)
+        except httpx.TransportError:
+            delay = _backoff_delay(attempt)
+        else:
+            if resp.status_code != 429 and resp.status_code < 500:
+                resp.raise_for_status()
+                return resp
+            delay = _backoff_delay(attempt, resp.headers.get("Retry-After"))
+        with _retry_lock:
+            _retry_count += 1
+        time.sleep(delay)
+
+    # Final attempt — any error propagates to the caller
+    with _request_slots:
+        resp = _get_client().post(url, headers=headers, content=body, timeout=timeout)
+    resp.raise_for_status()
+    return resp
+
+
+def _backoff_delay(attempt: int, retry_after: str | None = None) -> float:
+    """Exponential backoff with jitter, or the server's Retry-After if given."""
+    if retry_after:
+        try:
+            return min(float(retry_after), _MAX_BACKOFF_S)
+        except ValueError:
+            pass
+    return min(2.0 ** attempt, _MAX_BACKOFF_S) + random.uniform(0, 1)
+
+
+def _log_reasoning(
+    purpose: str, messages: list[dict[str, str]], result: str, provider: str, model: str,
+) -> None:
     """Log reasoning call for observability in QA Lab."""
     _reasoning_log.append({
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": time.time(),
         "provider": provider,
-        "model": get_model(),
+        "model": model,
         "purpose": purpose,
         "prompt_preview": messages[-1]["content"][:200] if messages else "",
         "response_preview": result[:300],
@@ -248,37 +439,49 @@ def _template_explain(case_title: str, evidence: list[str], anomaly_type: str) -
     return f"{base} Evidence: {'; '.join(evidence[:2])}."
 
 
+# Keyword → suggestions, checked in order; the first keyword found in the question wins
+_FOLLOW_UPS_BY_KEYWORD: tuple[tuple[tuple[str, ...], tuple[str, ...]], ...] = (
+    (("revenue",), (
+        "Which customers contributed most to the revenue change?",
+        "How does this compare to the same period last quarter?",
+        "What is the breakdown by plan tier?",
+    )),
+    (("refund",), (
+        "Which region has the highest refund rate?",
+        "Are there any duplicate refunds in the data?",
+        "What are the top refund reasons this month?",
+    )),
+    (("underbilling", "billing"), (
+        "Which plan tiers are most affected by underbilling?",
+        "What is the total billing gap this month?",
+        "How many customers have tier mismatches?",
+    )),
+)
+
+_FOLLOW_UPS_DEFAULT: tuple[str, ...] = (
+    "What are the top anomalies this week?",
+    "Show revenue trend for the last 30 days",
+    "Which region has the most billing exceptions?",
+)
+
+
 def _template_follow_ups(question: str) -> list[str]:
     q_lower = question.lower()
-
-    if "revenue" in q_lower:
-        return [
-            "Which customers contributed most to the revenue change?",
-            "How does this compare to the same period last quarter?",
-            "What is the breakdown by plan tier?",
-        ]
-    elif "refund" in q_lower:
-        return [
-            "Which region has the highest refund rate?",
-            "Are there any duplicate refunds in the data?",
-            "What are the top refund reasons this month?",
-        ]
-    elif "underbilling" in q_lower or "billing" in q_lower:
-        return [
-            "Which plan tiers are most affected by underbilling?",
-            "What is the total billing gap this month?",
-            "How many customers have tier mismatches?",
-        ]
-    else:
-        return [
-            "What are the top anomalies this week?",
-            "Show revenue trend for the last 30 days",
-            "Which region has the most billing exceptions?",
-        ]
+    for keywords, follow_ups in _FOLLOW_UPS_BY_KEYWORD:
+        if any(kw in q_lower for kw in keywords):
+            return list(follow_ups)
+    return list(_FOLLOW_UPS_DEFAULT)
 
 
 def reset() -> None:
-    global _last_used, _call_count, _reasoning_log
+    global _last_used, _call_count, _cache_hits, _cache_misses, _retry_count
     _last_used = None
     _call_count = 0
-    _reasoning_log = []
+    _retry_count = 0
+    _reasoning_log.clear()
+    is_available.cache_clear()
+    get_model.cache_clear()
+    with _cache_lock:
+        _response_cache.clear()
+        _cache_hits = 0
+        _cache_misses = 0
@@ -10,17 +10,22 @@ Uses heuristic keyword-based scoring tuned for financial operations text.
 
 from __future__ import annotations
 
+import bisect
 import json
 import re
+import time
+from collections import deque
 from datetime import datetime
 from typing import Any
 
+from app.config import settings
+
 # ---------------------------------------------------------------------------
 # State tracking
 # ---------------------------------------------------------------------------
 _last_used: datetime | None = None
 _call_count: int = 0
-_analysis_log: list[dict[str, Any]] = []
+_analysis_log: deque[dict[str, Any]] = deque(maxlen=settings.adapter_log_max_entries)
 
 
 # ---------------------------------------------------------------------------
@@ -125,11 +130,18 @@ _HIGH_RISK_KEYWORDS = [
     "duplicate refund", "revenue leakage", "manual credit",
 ]
 
+# Hedging words that mark evidence as opinion rather than fact
+_OPINION_WORDS = frozenset({
+    "seems", "appears", "likely", "possibly", "maybe", "probably", "suspect", "believe",
+})
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
 
 def _heuristic_sentiment(text: str, context: str = "") -> dict[str, Any]:
     """Keyword-based sentiment analysis for financial operations text."""
     text_lower = text.lower()
-    words = re.findall(r'\b\w+\b', text_lower)
+    words = _WORD_RE.findall(text_lower)
     total_words = max(len(words), 1)
 
     neg_count = sum(1 for kw in _NEGATIVE_KEYWORDS if kw in text_lower)
@@ -142,7 +154,7 @@ def _heuristic_sentiment(text: str, context: str = "") -> dict[str, Any]:
 
     # Subjectivity: 0 (objective/factual) to 1 (subjective/opinion)
     # Financial evidence tends to be factual, so base subjectivity is low
-    opinion_words = sum(1 for w in words if w in ["seems", "appears", "likely", "possibly", "maybe", "probably", "suspect", "believe"])
+    opinion_words = sum(1 for w in words if w in _OPINION_WORDS)
     subjectivity = min(1.0, opinion_words / total_words * 10 + 0.1)
 
     # Risk boost for high-risk keywords
@@ -182,25 +194,22 @@ def _heuristic_sentiment(text: str, context: str = "") -> dict[str, Any]:
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Certain anomaly types are inherently higher risk
+_TYPE_BOOSTS: dict[str, float] = {
+    "duplicate_refund": -0.15,
+    "manual_credit": -0.15,
+    "refund_spike": -0.1,
+}
+
+# Risk bins: adjusted < -0.5 → high, < -0.2 → elevated, < 0.2 → neutral, else low
+_RISK_THRESHOLDS = (-0.5, -0.2, 0.2)
+_RISK_LABELS = ("high", "elevated", "neutral", "low")
+
+
 def _polarity_to_risk(polarity: float, anomaly_type: str = "") -> str:
     """Convert polarity score to a risk level label."""
-    # Certain anomaly types are inherently higher risk
-    type_boost = 0.0
-    if anomaly_type in ("duplicate_refund", "manual_credit"):
-        type_boost = -0.15
-    elif anomaly_type == "refund_spike":
-        type_boost = -0.1
-
-    adjusted = polarity + type_boost
-
-    if adjusted < -0.5:
-        return "high"
-    elif adjusted < -0.2:
-        return "elevated"
-    elif adjusted < 0.2:
-        return "neutral"
-    else:
-        return "low"
+    adjusted = polarity + _TYPE_BOOSTS.get(anomaly_type, 0.0)
+    return _RISK_LABELS[bisect.bisect_right(_RISK_THRESHOLDS, adjusted)]
 
 
 def _generate_assessment(
@@ -250,7 +259,7 @@ def _empty_result(context: str = "") -> dict[str, Any]:
 def _log_analysis(text: str, result: dict[str, Any], provider: str) -> None:
     """Log analysis for observability."""
     _analysis_log.append({
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": time.time(),
         "provider": provider,
         "text_preview": text[:100],
         "polarity": result.get("polarity", 0),
@@ -260,12 +269,15 @@ def _log_analysis(text: str, result: dict[str, Any], provider: str) -> None:
 
 def get_analysis_log() -> list[dict[str, Any]]:
     """Return the sentiment analysis log."""
-    return list(_analysis_log)
+    return [
+        {**entry, "timestamp": datetime.utcfromtimestamp(entry["timestamp"]).isoformat()}
+        for entry in _analysis_log
+    ]
 
 
 def reset() -> None:
     """Reset adapter state."""
-    global _last_used, _call_count, _analysis_log
+    global _last_used, _call_count
     _last_used = None
     _call_count = 0
-    _analysis_log = []
+    _analysis_log.clear()
@@ -5,12 +5,13 @@ Flow:
   2. Execute query against DuckDB
   3. Build chart from results (chart_tool + Lightdash config)
   4. Generate answer summary (template-based, LLM-enhanced if available)
-  5. Generate follow-up suggestions
+  5. Generate follow-up suggestions (concurrently with step 4's LLM rewrite)
   6. Return AnalystResponse
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
@@ -48,24 +49,30 @@ def ask(question: str) -> AnalystResponse:
         raw_answer = result["answer_template"]
         confidence = Confidence.low
 
-    # Step 3: Optional LLM enhancement
-    answer = rewrite_answer(raw_answer, question)
-
-    # Step 4: Build chart
-    chart_data = None
-    chart_type = result.get("chart_type", "bar")
-    if result.get("chart_data"):
-        # Find related Lightdash metric for chart config
-        metric_name = _find_related_metric(result["name"])
-        chart_data = build_chart(
-            chart_data=result["chart_data"],
-            chart_type=chart_type,
-            title=result["description"],
-            metric_name=metric_name,
-        )
-
-    # Step 5: Follow-ups
-    follow_ups = generate_follow_ups(question, answer)
+    # Step 3: Optional LLM enhancement + follow-ups, in the background, so their
+    # round-trips overlap chart building. Follow-ups are drafted from the raw
+    # answer — the rewrite keeps the same data points, so they don't need to
+    # wait for it. The pool is per request so concurrent asks don't queue.
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="analyst-llm") as llm_pool:
+        answer_future = llm_pool.submit(rewrite_answer, raw_answer, question)
+        follow_ups_future = llm_pool.submit(generate_follow_ups, question, raw_answer)
+
+        # Step 4: Build chart
+        chart_data = None
+        chart_type = result.get("chart_type", "bar")
+        if result.get("chart_data"):
+            # Find related Lightdash metric for chart config
+            metric_name = _find_related_metric(result["name"])
+            chart_data = build_chart(
+                chart_data=result["chart_data"],
+                chart_type=chart_type,
+                title=result["description"],
+                metric_name=metric_name,
+            )
+
+        # Step 5: Collect the LLM results
+        answer = answer_future.result()
+        follow_ups = follow_ups_future.result()
 
     print(f"  Confidence: {confidence.value}")
     print(f"  Chart: {'yes' if chart_data else 'no'}")
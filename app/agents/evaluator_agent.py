@@ -13,12 +13,14 @@ Called after each triage run and after feedback is processed.
 from __future__ import annotations
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
-from app.models.schemas import EvalScore, TriageCase, CaseStatus
+from app.config import settings
+from app.models.schemas import EvalScore, TriageCase, CaseStatus, Confidence
 from app.storage.eval_store import save_eval
-from app.storage.case_store import get_cases_by_run, get_all_cases
+from app.storage.case_store import get_cases_by_run, get_cases_by_runs, get_all_cases
 from app.storage.feedback_store import get_false_positive_case_ids, get_feedback_counts
 from app.adapters.llm_client import chat, is_available as llm_available
 
@@ -41,30 +43,82 @@ def evaluate_run(run_id: str) -> EvalScore:
     fp_ids = set(get_false_positive_case_ids())
     fb_counts = get_feedback_counts()
 
+    return _save_score(_score_run(run_id, cases, fp_ids, fb_counts))
+
+
+def evaluate_runs(run_ids: list[str]) -> list[EvalScore]:
+    """Evaluate several triage runs, overlapping their LLM calibration calls.
+
+    Cases for every run come from one query and feedback is read once. Scores
+    are persisted on the calling thread since SQLite shares one connection.
+    """
+    if not run_ids:
+        return []
+
+    cases_by_run = get_cases_by_runs(run_ids)
+    fp_ids = set(get_false_positive_case_ids())
+    fb_counts = get_feedback_counts()
+
+    # llm_client bounds in-flight requests and backs off on 429, so the pool
+    # only needs to be wide enough to keep those request slots busy
+    workers = min(len(run_ids), settings.llm_max_concurrency)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        scores = list(pool.map(
+            lambda rid: _score_run(rid, cases_by_run[rid], fp_ids, fb_counts), run_ids,
+        ))
+
+    return [_save_score(score) for score in scores]
+
+
+def _score_run(
+    run_id: str,
+    cases: list[TriageCase],
+    fp_ids: set[str],
+    fb_counts: dict[str, int],
+) -> EvalScore:
+    """Score one run's cases with heuristics plus the LLM calibration note."""
     total = len(cases)
-    fp_count = sum(1 for c in cases if c.case_id in fp_ids or c.status == CaseStatus.false_positive)
+
+    # Tally everything the heuristics need in a single pass over the cases
+    fp_status = CaseStatus.false_positive
+    fp_case_ids: set[str] = set()
+    high_conf_fp = has_action = has_evidence = has_impact = has_detail = 0
+    for c in cases:
+        if c.case_id in fp_ids or c.status == fp_status:
+            fp_case_ids.add(c.case_id)
+            if c.confidence == Confidence.high:
+                high_conf_fp += 1
+        if c.recommended_action:
+            has_action += 1
+        evidence_count = len(c.evidence)
+        if evidence_count >= 2:
+            has_evidence += 1
+        if evidence_count >= 3:
+            has_detail += 1
+        if c.estimated_impact > 0:
+            has_impact += 1
+
+    fp_count = len(fp_case_ids)
 
     # --- Heuristic scores (baseline) ---
     if total == 0:
         actionability, correctness, specificity = 1, 3, 1
     else:
-        has_action = sum(1 for c in cases if c.recommended_action)
-        has_evidence = sum(1 for c in cases if len(c.evidence) >= 2)
         action_ratio = (has_action + has_evidence) / (2 * total)
         actionability = max(1, min(5, round(action_ratio * 5)))
 
         fp_rate = fp_count / total
         correctness = max(1, min(5, round((1 - fp_rate) * 5)))
 
-        has_impact = sum(1 for c in cases if c.estimated_impact > 0)
-        has_detail = sum(1 for c in cases if len(c.evidence) >= 3)
         spec_ratio = (has_impact + has_detail) / (2 * total)
         specificity = max(1, min(5, round(spec_ratio * 5)))
 
     # --- LLM-powered calibration analysis ---
-    calibration_note = _llm_evaluate_calibration(cases, fp_ids, fb_counts, actionability, correctness, specificity)
+    calibration_note = _llm_evaluate_calibration(
+        cases, fp_case_ids, high_conf_fp, fb_counts, actionability, correctness, specificity,
+    )
 
-    score = EvalScore(
+    return EvalScore(
         run_id=run_id,
         actionability=actionability,
         correctness=correctness,
@@ -75,40 +129,21 @@ def evaluate_run(run_id: str) -> EvalScore:
         timestamp=datetime.utcnow(),
     )
 
+
+def _save_score(score: EvalScore) -> EvalScore:
     saved = save_eval(score)
-    print(f"[evaluator] Run {run_id}: actionability={actionability} correctness={correctness} specificity={specificity} FP={fp_count}/{total}")
+    print(f"[evaluator] Run {score.run_id}: actionability={score.actionability} correctness={score.correctness} specificity={score.specificity} FP={score.false_positive_count}/{score.total_cases}")
     return saved
 
 
-def _llm_evaluate_calibration(
-    cases: list[TriageCase],
-    fp_ids: set[str],
-    fb_counts: dict[str, int],
-    actionability: int,
-    correctness: int,
-    specificity: int,
-) -> str:
-    """Use LLM to analyze calibration and generate improvement suggestions."""
-    if not llm_available():
-        return _heuristic_calibration(cases, fp_ids, fb_counts)
-
-    case_summaries = []
-    for c in cases[:8]:
-        is_fp = c.case_id in fp_ids or c.status == CaseStatus.false_positive
-        case_summaries.append(
-            f"- {c.case_id}: {c.title} | severity={c.severity.value} | confidence={c.confidence.value} | "
-            f"impact=${c.estimated_impact:,.2f} | evidence_count={len(c.evidence)} | "
-            f"false_positive={'YES' if is_fp else 'no'}"
-        )
-
-    prompt = f"""You are the OpsIQ evaluator agent. Analyze this triage run's quality.
+_CALIBRATION_PROMPT = """You are the OpsIQ evaluator agent. Analyze this triage run's quality.
 
 Heuristic scores: actionability={actionability}/5, correctness={correctness}/5, specificity={specificity}/5
-False positives: {sum(1 for c in cases if c.case_id in fp_ids or c.status == CaseStatus.false_positive)}/{len(cases)}
+False positives: {fp_count}/{total}
 Feedback counts: {fb_counts}
 
 Cases:
-{chr(10).join(case_summaries) if case_summaries else 'No cases generated.'}
+{case_lines}
 
 Provide:
 1. CALIBRATION ASSESSMENT: Are confidence scores well-calibrated? Are high-confidence cases actually correct?
@@ -118,27 +153,62 @@ Provide:
 
 Be specific and actionable. Reference case IDs where relevant."""
 
+
+def _llm_evaluate_calibration(
+    cases: list[TriageCase],
+    fp_case_ids: set[str],
+    high_conf_fp: int,
+    fb_counts: dict[str, int],
+    actionability: int,
+    correctness: int,
+    specificity: int,
+) -> str:
+    """Use LLM to analyze calibration and generate improvement suggestions.
+
+    fp_case_ids and high_conf_fp come from _score_run's tally of the run's cases.
+    """
+    if not llm_available():
+        return _heuristic_calibration(len(cases), len(fp_case_ids), high_conf_fp, fb_counts)
+
+    # Sorted by case_id so identical runs produce an identical prompt (and hit
+    # the chat() response cache) regardless of row order
+    case_lines = []
+    for c in sorted(cases[:8], key=lambda c: c.case_id):
+        is_fp = c.case_id in fp_case_ids
+        case_lines.append(
+            f"- {c.case_id}: {c.title} | severity={c.severity.value} | confidence={c.confidence.value} | "
+            f"impact=${c.estimated_impact:,.2f} | evidence_count={len(c.evidence)} | "
+            f"false_positive={'YES' if is_fp else 'no'}"
+        )
+
+    prompt = _CALIBRATION_PROMPT.format(
+        actionability=actionability,
+        correctness=correctness,
+        specificity=specificity,
+        fp_count=len(fp_case_ids),
+        total=len(cases),
+        fb_counts=fb_counts,
+        case_lines="\n".join(case_lines) if case_lines else "No cases generated.",
+    )
+
     result = chat([
         {"role": "system", "content": "You are an AI quality evaluator for a billing anomaly detection system. Provide specific, actionable calibration analysis."},
         {"role": "user", "content": prompt},
-    ], max_tokens=500, purpose="evaluator_calibration_analysis")
+    ], max_tokens=500, purpose="evaluator_calibration_analysis", tier="fast")
 
-    return result if result else _heuristic_calibration(cases, fp_ids, fb_counts)
+    return result if result else _heuristic_calibration(len(cases), len(fp_case_ids), high_conf_fp, fb_counts)
 
 
 def _heuristic_calibration(
-    cases: list[TriageCase],
-    fp_ids: set[str],
+    total: int,
+    fp_count: int,
+    high_conf_fp: int,
     fb_counts: dict[str, int],
 ) -> str:
     """Fallback heuristic calibration note."""
-    total = len(cases)
-    fp_count = sum(1 for c in cases if c.case_id in fp_ids or c.status == CaseStatus.false_positive)
     parts = []
     if fp_count > 0:
         parts.append(f"{fp_count}/{total} cases marked as false positives")
-    high_conf_cases = [c for c in cases if c.confidence.value == "high"]
-    high_conf_fp = sum(1 for c in high_conf_cases if c.case_id in fp_ids or c.status == CaseStatus.false_positive)
     if high_conf_fp > 0:
         parts.append(f"{high_conf_fp} high-confidence cases were false positives — confidence may be over-calibrated")
     approved = fb_counts.get("approve", 0)
@@ -9,17 +9,18 @@ Responsibilities:
 
 from __future__ import annotations
 
-import json
 from datetime import datetime
 from typing import Any
 
-from app.models.schemas import SignalEvent, Severity
+import orjson
+
+from app.models.schemas import SEVERITY_BY_VALUE, SignalEvent, Severity
 from app.adapters import datadog_adapter, lightdash_adapter
-from app.services.data_service import query_rows
+from app.services.data_service import query_tuples
 
 
-# Severity priority for sorting
-_SEVERITY_ORDER = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+# Severity priority for sorting, keyed by enum member so the sort key skips .value
+_SEVERITY_ORDER = {Severity.critical: 0, Severity.high: 1, Severity.medium: 2, Severity.low: 3}
 
 
 def fetch_all_signals() -> list[SignalEvent]:
@@ -51,10 +52,7 @@ def fetch_all_signals() -> list[SignalEvent]:
         print(f"  [monitor_agent] Internal fetch error: {e}")
 
     # Sort by severity (highest first), then by timestamp (newest first)
-    all_signals.sort(key=lambda s: (
-        _SEVERITY_ORDER.get(s.severity.value, 9),
-        -s.timestamp.timestamp(),
-    ))
+    all_signals.sort(key=lambda s: (_SEVERITY_ORDER[s.severity], -s.timestamp.timestamp()))
 
     print(f"  [monitor_agent] Total signals: {len(all_signals)}")
     return all_signals
@@ -102,25 +100,17 @@ def enrich_signal(signal: SignalEvent) -> dict[str, Any]:
 
 
 def _find_related_metrics(signal: SignalEvent) -> list[dict[str, Any]]:
-    """Find Lightdash metric definitions related to a signal."""
-    metrics = lightdash_adapter.get_metric_definitions()
-    related_entity = signal.related_entity.lower()
-
-    related = []
-    for m in metrics:
-        # Match by table name or metric name containing the entity
-        if (related_entity in m.get("name", "").lower()
-                or related_entity in m.get("table", "").lower()
-                or related_entity in m.get("description", "").lower()):
-            related.append({"name": m["name"], "label": m["label"], "description": m["description"]})
+    """Find Lightdash metric definitions related to a signal.
 
-    return related
+    Matches by metric name, table name or description containing the entity.
+    """
+    return lightdash_adapter.find_related_metrics(signal.related_entity)
 
 
 def _fetch_internal_signals() -> list[SignalEvent]:
     """Read internal signals from DuckDB signal_events table."""
-    rows = query_rows("""
-        SELECT signal_id, timestamp, signal_type, severity, source,
+    rows = query_tuples("""
+        SELECT signal_id, timestamp, signal_type, severity,
                related_entity, payload_json
         FROM signal_events
         WHERE source = 'internal'
@@ -128,21 +118,16 @@ def _fetch_internal_signals() -> list[SignalEvent]:
     """)
 
     signals = []
-    for r in rows:
-        payload = {}
-        if r.get("payload_json"):
-            try:
-                payload = json.loads(r["payload_json"]) if isinstance(r["payload_json"], str) else r["payload_json"]
-            except (json.JSONDecodeError, TypeError):
-                payload = {}
-
-        signals.append(SignalEvent(
-            signal_id=r["signal_id"],
-            timestamp=r["timestamp"],
-            signal_type=r["signal_type"],
-            severity=Severity(r["severity"]),
+    for signal_id, ts, signal_type, severity, related_entity, raw in rows:
+        payload = orjson.loads(raw) if raw is not None else {}
+
+        signals.append(SignalEvent.model_construct(
+            signal_id=signal_id,
+            timestamp=datetime.fromisoformat(str(ts)),
+            signal_type=signal_type,
+            severity=SEVERITY_BY_VALUE[severity],
             source="internal",
-            related_entity=r["related_entity"],
+            related_entity=related_entity,
             payload=payload,
         ))
 
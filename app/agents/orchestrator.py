@@ -20,11 +20,13 @@ This is the single entry point for `/monitor/run` and the demo flow.
 
 from __future__ import annotations
 
-import json
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterable
+
+import orjson
 
 from app.models.schemas import (
     AutonomousRunResult, SignalEvent, TraceRecord, TriageCase,
@@ -32,7 +34,7 @@ from app.models.schemas import (
 from app.agents.monitor_agent import fetch_all_signals, pick_trigger_signal, enrich_signal
 from app.agents.triage_agent import run_triage
 from app.adapters import airia_adapter, lightdash_adapter, modulate_adapter
-from app.adapters.llm_client import chat, is_available as llm_available
+from app.adapters.llm_client import chat, get_provider, is_available as llm_available
 from app.storage.trace_store import save_trace
 from app.storage.case_store import clear_cases
 from app.storage.memory_store import get_all_memory
@@ -42,30 +44,19 @@ from app.storage.memory_store import get_all_memory
 # LLM Reasoning helpers
 # ---------------------------------------------------------------------------
 
-def _llm_analyze_signals(signals: list[SignalEvent], memory: list[Any]) -> str:
-    """LLM reasons about incoming signals and decides investigation strategy."""
-    if not llm_available():
-        return "LLM unavailable — using rule-based signal prioritization."
-
-    signal_summaries = []
-    for s in signals[:10]:  # Cap to avoid token overflow
-        signal_summaries.append(
-            f"- [{s.severity.value.upper()}] {s.signal_type} from {s.source}: {s.related_entity} (payload: {json.dumps(s.payload)[:150]})"
-        )
-
-    memory_notes = []
-    for m in memory:
-        memory_notes.append(f"- {m.key} = {m.value} (reason: {m.reason})")
+# Prompts are fixed module text so every run sends the same instruction prefix;
+# only the signal / case / memory lines vary between calls.
+_SIGNAL_ANALYSIS_SYSTEM = "You are an autonomous billing operations AI agent. You reason about signals, decide investigation priorities, and explain your thinking clearly."
 
-    prompt = f"""You are the OpsIQ orchestrator agent — an autonomous AI that investigates billing anomalies.
+_SIGNAL_ANALYSIS_PROMPT = """You are the OpsIQ orchestrator agent — an autonomous AI that investigates billing anomalies.
 
-You have received {len(signals)} signals from monitoring sources (Datadog, Lightdash, internal).
+You have received {signal_count} signals from monitoring sources (Datadog, Lightdash, internal).
 
 Signals:
-{chr(10).join(signal_summaries) if signal_summaries else 'No signals received.'}
+{signal_lines}
 
 Memory (learned from past feedback):
-{chr(10).join(memory_notes) if memory_notes else 'No memory entries yet.'}
+{memory_lines}
 
 Analyze these signals and provide:
 1. PRIORITY ASSESSMENT: Which signal is most urgent and why?
@@ -75,33 +66,17 @@ Analyze these signals and provide:
 
 Be concise and specific. Focus on actionable reasoning."""
 
-    return chat([
-        {"role": "system", "content": "You are an autonomous billing operations AI agent. You reason about signals, decide investigation priorities, and explain your thinking clearly."},
-        {"role": "user", "content": prompt},
-    ], max_tokens=600, purpose="orchestrator_signal_analysis")
+_SYNTHESIS_SYSTEM = "You are an autonomous billing operations AI agent producing an executive summary of your investigation findings."
 
+_SYNTHESIS_PROMPT = """You are the OpsIQ orchestrator agent. You just completed an autonomous investigation.
 
-def _llm_synthesize_cases(cases: list[TriageCase], signal: SignalEvent, reasoning: str) -> str:
-    """LLM reviews triage results and generates executive summary."""
-    if not llm_available():
-        total_impact = sum(c.estimated_impact for c in cases)
-        return f"Found {len(cases)} anomalies with ${total_impact:,.2f} total estimated impact."
-
-    case_summaries = []
-    for c in cases[:8]:
-        case_summaries.append(
-            f"- [{c.severity.value.upper()}] {c.title} | Impact: ${c.estimated_impact:,.2f} | Confidence: {c.confidence.value} | Action: {c.recommended_action}"
-        )
-
-    prompt = f"""You are the OpsIQ orchestrator agent. You just completed an autonomous investigation.
-
-Trigger signal: {signal.signal_id} ({signal.source}, {signal.severity.value})
+Trigger signal: {signal_id} ({source}, {severity})
 
 Your earlier reasoning:
-{reasoning[:500]}
+{reasoning}
 
-Triage results ({len(cases)} cases found):
-{chr(10).join(case_summaries) if case_summaries else 'No anomalies detected.'}
+Triage results ({case_count} cases found):
+{case_lines}
 
 Provide an EXECUTIVE SUMMARY:
 1. KEY FINDINGS: What are the most important anomalies found?
@@ -111,10 +86,102 @@ Provide an EXECUTIVE SUMMARY:
 
 Be concise. This summary will be shown to the operations team."""
 
+_ACTION_DECISION_SYSTEM = "You are an autonomous AI agent deciding what remediation actions to take for billing anomalies."
+
+_ACTION_DECISION_PROMPT = """You are the OpsIQ orchestrator. Based on these triage cases, decide what actions to take:
+
+{case_lines}
+
+For each case, decide:
+1. Should we create a remediation workflow? (via Airia)
+2. Should we send an alert to the finance team?
+3. Should we create an approval task for a manager?
+4. What is the urgency level?
+
+Be specific about which cases need which actions and why."""
+
+# Prompt-block budgets in estimated tokens; lines are packed in priority order
+# (signals and cases arrive ranked) until the next one would not fit
+_SIGNAL_BLOCK_TOKENS = 1024
+_CASE_BLOCK_TOKENS = 512
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English and JSON)."""
+    return len(text) // 4 + 1
+
+
+def _pack_lines(lines: Iterable[str], budget: int, total: int) -> list[str]:
+    """Take lines in order while their estimated token total stays within budget.
+
+    The first line is always kept (cut to the budget if it alone is too long),
+    and when lines are dropped a trailing note says how many of `total` were left out.
+    """
+    packed: list[str] = []
+    used = 0
+    for line in lines:
+        cost = _estimate_tokens(line)
+        if not packed and cost > budget:
+            line, cost = line[:budget * 4], budget
+        elif used + cost > budget:
+            break
+        packed.append(line)
+        used += cost
+    if total > len(packed):
+        packed.append(f"- ... {total - len(packed)} more omitted")
+    return packed
+
+
+def _llm_analyze_signals(signals: list[SignalEvent], memory: list[Any]) -> str:
+    """LLM reasons about incoming signals and decides investigation strategy."""
+    if not llm_available():
+        return "LLM unavailable — using rule-based signal prioritization."
+
+    signal_summaries = _pack_lines((
+        f"- [{s.severity.value.upper()}] {s.signal_type} from {s.source}: {s.related_entity} (payload: {orjson.dumps(s.payload).decode()[:150]})"
+        for s in signals
+    ), _SIGNAL_BLOCK_TOKENS, len(signals))
+
+    memory_notes = []
+    for m in memory:
+        memory_notes.append(f"- {m.key} = {m.value} (reason: {m.reason})")
+
+    prompt = _SIGNAL_ANALYSIS_PROMPT.format(
+        signal_count=len(signals),
+        signal_lines="\n".join(signal_summaries) if signal_summaries else 'No signals received.',
+        memory_lines="\n".join(memory_notes) if memory_notes else 'No memory entries yet.',
+    )
+
+    return chat([
+        {"role": "system", "content": _SIGNAL_ANALYSIS_SYSTEM},
+        {"role": "user", "content": prompt},
+    ], max_tokens=600, purpose="orchestrator_signal_analysis")
+
+
+def _llm_synthesize_cases(cases: list[TriageCase], signal: SignalEvent, reasoning: str) -> str:
+    """LLM reviews triage results and generates executive summary."""
+    if not llm_available():
+        total_impact = sum(c.estimated_impact for c in cases)
+        return f"Found {len(cases)} anomalies with ${total_impact:,.2f} total estimated impact."
+
+    case_summaries = _pack_lines((
+        f"- [{c.severity.value.upper()}] {c.title} | Impact: ${c.estimated_impact:,.2f} | Confidence: {c.confidence.value} | Action: {c.recommended_action}"
+        for c in cases
+    ), _CASE_BLOCK_TOKENS, len(cases))
+
+    prompt = _SYNTHESIS_PROMPT.format(
+        signal_id=signal.signal_id,
+        source=signal.source,
+        severity=signal.severity.value,
+        reasoning=reasoning[:500],
+        case_count=len(cases),
+        case_lines="\n".join(case_summaries) if case_summaries else 'No anomalies detected.',
+    )
+
     return chat([
-        {"role": "system", "content": "You are an autonomous billing operations AI agent producing an executive summary of your investigation findings."},
+        {"role": "system", "content": _SYNTHESIS_SYSTEM},
         {"role": "user", "content": prompt},
-    ], max_tokens=600, purpose="orchestrator_executive_summary")
+    ], max_tokens=450, purpose="orchestrator_executive_summary")
 
 
 def _llm_decide_actions(cases: list[TriageCase]) -> str:
@@ -128,22 +195,12 @@ def _llm_decide_actions(cases: list[TriageCase]) -> str:
             f"- {c.case_id}: {c.title} (severity={c.severity.value}, impact=${c.estimated_impact:,.2f})"
         )
 
-    prompt = f"""You are the OpsIQ orchestrator. Based on these triage cases, decide what actions to take:
-
-{chr(10).join(case_summaries)}
-
-For each case, decide:
-1. Should we create a remediation workflow? (via Airia)
-2. Should we send an alert to the finance team?
-3. Should we create an approval task for a manager?
-4. What is the urgency level?
-
-Be specific about which cases need which actions and why."""
+    prompt = _ACTION_DECISION_PROMPT.format(case_lines="\n".join(case_summaries))
 
     return chat([
-        {"role": "system", "content": "You are an autonomous AI agent deciding what remediation actions to take for billing anomalies."},
+        {"role": "system", "content": _ACTION_DECISION_SYSTEM},
         {"role": "user", "content": prompt},
-    ], max_tokens=400, purpose="orchestrator_action_decision")
+    ], max_tokens=300, purpose="orchestrator_action_decision")
 
 
 # ---------------------------------------------------------------------------
@@ -169,7 +226,7 @@ def run_autonomous(signal: SignalEvent | None = None) -> AutonomousRunResult:
 
     print(f"\n{'='*60}")
     print(f"[orchestrator] Autonomous run {run_id} starting...")
-    print(f"  LLM: {'ACTIVE (' + str(llm_available()) + ')' if llm_available() else 'FALLBACK (deterministic)'}")
+    print(f"  LLM: {'ACTIVE (' + get_provider() + ')' if llm_available() else 'FALLBACK (deterministic)'}")
     print(f"{'='*60}\n")
 
     # --- Step 1: Monitor — ingest signals ---
@@ -194,31 +251,45 @@ def run_autonomous(signal: SignalEvent | None = None) -> AutonomousRunResult:
     tools_called.append("llm_client")
     print(f"\n[orchestrator] Step 2: LLM analyzing {len(all_signals)} signals...")
     memory = get_all_memory()
-    signal_reasoning = _llm_analyze_signals(all_signals, memory)
+    # Signal analysis overlaps enrichment + triage (it only feeds the synthesis),
+    # and the action decision overlaps the synthesis, so LLM round-trips don't
+    # stack. The pool is per run so concurrent runs never queue behind each other.
+    llm_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"orchestrator-{run_id}")
+    try:
+        signal_reasoning_future = llm_pool.submit(_llm_analyze_signals, all_signals, memory)
+
+        # --- Step 3: Enrich signal ---
+        steps.append("enrich_signal")
+        print(f"\n[orchestrator] Step 3: Enriching signal {signal.signal_id}...")
+        enrichment = enrich_signal(signal)
+        print(f"  Enrichment source: {enrichment.get('adapter_context', {}).get('source', 'unknown')}")
+
+        # --- Step 4: Fetch metric context ---
+        steps.append("fetch_metric_context")
+        tools_called.append("lightdash_adapter")
+        print("\n[orchestrator] Step 4: Fetching metric context...")
+        metric_defs = lightdash_adapter.get_metric_definitions()
+        print(f"  Loaded {len(metric_defs)} metric definitions")
+
+        # --- Step 5: Triage — detect, score, create cases (includes sentiment analysis) ---
+        steps.append("run_triage")
+        tools_called.extend(["anomaly_tool", "scoring_tool", "sentiment_engine"])
+        print("\n[orchestrator] Step 5: Running triage (with sentiment analysis)...")
+        clear_cases()
+        cases = run_triage(run_id)
+        print(f"  Generated {len(cases)} cases")
+
+        # The action decision only needs the cases, so it starts before the synthesis
+        # has the signal reasoning it builds on
+        action_reasoning_future = llm_pool.submit(_llm_decide_actions, cases)
+    finally:
+        # Both jobs are queued (or the run failed); let the workers exit once idle
+        llm_pool.shutdown(wait=False)
+
+    signal_reasoning = signal_reasoning_future.result()
     reasoning_trace["signal_analysis"] = signal_reasoning
     print(f"  LLM reasoning: {signal_reasoning[:150]}...")
 
-    # --- Step 3: Enrich signal ---
-    steps.append("enrich_signal")
-    print(f"\n[orchestrator] Step 3: Enriching signal {signal.signal_id}...")
-    enrichment = enrich_signal(signal)
-    print(f"  Enrichment source: {enrichment.get('adapter_context', {}).get('source', 'unknown')}")
-
-    # --- Step 4: Fetch metric context ---
-    steps.append("fetch_metric_context")
-    tools_called.append("lightdash_adapter")
-    print("\n[orchestrator] Step 4: Fetching metric context...")
-    metric_defs = lightdash_adapter.get_metric_definitions()
-    print(f"  Loaded {len(metric_defs)} metric definitions")
-
-    # --- Step 5: Triage — detect, score, create cases (includes sentiment analysis) ---
-    steps.append("run_triage")
-    tools_called.extend(["anomaly_tool", "scoring_tool", "sentiment_engine"])
-    print("\n[orchestrator] Step 5: Running triage (with sentiment analysis)...")
-    clear_cases()
-    cases = run_triage(run_id)
-    print(f"  Generated {len(cases)} cases")
-
     # --- Step 6: LLM Synthesis — review cases & generate executive summary ---
     steps.append("llm_synthesis")
     print("\n[orchestrator] Step 6: LLM synthesizing findings...")
@@ -229,7 +300,7 @@ def run_autonomous(signal: SignalEvent | None = None) -> AutonomousRunResult:
     # --- Step 7: LLM Action Decision ---
     steps.append("llm_action_decision")
     print("\n[orchestrator] Step 7: LLM deciding actions...")
-    action_reasoning = _llm_decide_actions(cases)
+    action_reasoning = action_reasoning_future.result()
     reasoning_trace["action_decision"] = action_reasoning
     print(f"  Action reasoning: {action_reasoning[:150]}...")
 
@@ -278,7 +349,7 @@ def run_autonomous(signal: SignalEvent | None = None) -> AutonomousRunResult:
         timestamp=datetime.utcnow(),
         trigger_source=signal.signal_id,
         steps=steps,
-        tools_called=list(set(tools_called)),
+        tools_called=list(dict.fromkeys(tools_called)),  # dedupe, keep call order
         cases_generated=len(cases),
         actions_created=len(actions),
         eval_summary=executive_summary[:500] if executive_summary else None,
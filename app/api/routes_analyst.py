@@ -1,8 +1,9 @@
 """Analyst Q&A endpoints."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
+from app.adapters.lightdash_adapter import get_metric_definitions_json
 from app.agents.analyst_agent import ask
 
 router = APIRouter(prefix="/analyst", tags=["analyst"])
@@ -18,3 +19,9 @@ def analyst_query(req: QueryRequest):
     """Ask a business question and get an analyst-style response with chart + SQL."""
     response = ask(req.question)
     return response.model_dump()
+
+
+@router.get("/metrics")
+def analyst_metrics():
+    """Return the semantic metric definitions the analyst works from."""
+    return Response(content=get_metric_definitions_json(), media_type="application/json")
@@ -1,7 +1,9 @@
 """Evaluation, memory, and LLM observability endpoints."""
 
 from fastapi import APIRouter
+from pydantic import BaseModel, Field
 
+from app.agents.evaluator_agent import evaluate_runs
 from app.storage.eval_store import get_all_evals, get_latest_eval
 from app.storage.memory_store import get_all_memory
 from app.storage.trace_store import get_all_traces, get_latest_trace
@@ -9,6 +11,13 @@ from app.adapters.llm_client import get_status as llm_status, get_reasoning_log
 
 router = APIRouter(tags=["eval"])
 
+# Upper bound on runs re-evaluated per request; each run costs an LLM call
+_MAX_EVAL_RUNS = 50
+
+
+class EvaluateRunsRequest(BaseModel):
+    run_ids: list[str] = Field(max_length=_MAX_EVAL_RUNS)
+
 
 @router.get("/eval/latest")
 def latest_eval():
@@ -26,6 +35,13 @@ def all_evals():
     return {"evals": [e.model_dump() for e in evals], "count": len(evals)}
 
 
+@router.post("/eval/runs")
+def reevaluate_runs(req: EvaluateRunsRequest):
+    """Re-evaluate several triage runs in one batch."""
+    scores = evaluate_runs(req.run_ids)
+    return {"evals": [e.model_dump() for e in scores], "count": len(scores)}
+
+
 @router.get("/memory")
 def get_memory():
     """Return all memory entries (self-improvement state)."""
@@ -19,11 +19,18 @@ class Settings(BaseSettings):
     groq_model: str = "llama-3.3-70b-versatile"
     openai_api_key: str = ""
     openai_model: str = "gpt-4o-mini"
+    groq_fast_model: str = "llama-3.1-8b-instant"   # short display-only summaries
+    openai_fast_model: str = "gpt-4o-mini"
+    llm_max_concurrency: int = Field(default=4, ge=1)   # provider requests in flight at once
+    llm_max_attempts: int = Field(default=4, ge=1)      # tries per request on 429 / 5xx / timeout
 
     # --- Server ---
     backend_host: str = "0.0.0.0"
     backend_port: int = 8000
 
+    # --- Observability (in-memory adapter logs keep only the newest N entries) ---
+    adapter_log_max_entries: int = Field(default=1000, ge=1)
+
     model_config = {
         "env_file": str(PROJECT_ROOT / ".env"),
         "env_file_encoding": "utf-8",
@@ -1,11 +1,14 @@
 """OpsIQ FastAPI application — Self-Improving Operational Intelligence Agent."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.adapters import llm_client
 from app.services.data_service import get_db
 from app.api.routes_health import router as health_router
 from app.api.routes_monitor import router as monitor_router
@@ -19,9 +22,11 @@ from app.api.routes_sentiment import router as sentiment_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize DuckDB on startup."""
+    """Initialize DuckDB (and warm the LLM connection) on startup."""
     print("[main] OpsIQ starting up...")
     get_db()  # Eagerly load data
+    # Pre-open the LLM provider connection in the background; don't delay startup
+    asyncio.get_running_loop().run_in_executor(None, llm_client.warmup)
     print("[main] Ready.")
     yield
     print("[main] Shutting down.")
@@ -32,6 +37,7 @@ app = FastAPI(
     description="Self-Improving Operational Intelligence Agent",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS — allow Streamlit frontend
@@ -20,6 +20,10 @@ class Severity(str, Enum):
     critical = "critical"
 
 
+# Value -> member map for hot loops that would otherwise call Severity(value) per row
+SEVERITY_BY_VALUE: dict[str, Severity] = {s.value: s for s in Severity}
+
+
 class Confidence(str, Enum):
     low = "low"
     medium = "medium"
@@ -1,15 +1,17 @@
 """DuckDB data service — loads CSVs into an in-memory DuckDB instance.
 
 Usage:
-    from app.services.data_service import get_db, query_df, query_rows
+    from app.services.data_service import get_db, query_df, query_rows, query_tuples
 
     df = query_df("SELECT * FROM customers WHERE region = 'EMEA'")
     rows = query_rows("SELECT count(*) as cnt FROM refunds")
+    rows = query_tuples("SELECT customer_id, region FROM customers")
 """
 
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -23,6 +25,12 @@ from app.config import DATA_DIR
 # ---------------------------------------------------------------------------
 _conn: duckdb.DuckDBPyConnection | None = None
 
+# The shared connection is not safe for concurrent execute() from FastAPI's
+# worker threads, so every statement + fetch (and reset's close) runs under
+# this lock; readers fetch the connection inside it so reset can't close it
+# between lookup and execute
+_query_lock = threading.RLock()
+
 # CSV files to load as tables (filename stem becomes table name)
 _TABLES = [
     "customers",
@@ -34,6 +42,13 @@ _TABLES = [
     "signal_events",
 ]
 
+# Sort keys applied when loading a table. Every signal_events reader filters
+# on source, so clustering by it lets DuckDB's per-row-group min/max skip
+# row groups belonging to other sources
+_CLUSTER_BY: dict[str, str] = {
+    "signal_events": "source, timestamp",
+}
+
 
 def _init_db() -> duckdb.DuckDBPyConnection:
     """Create in-memory DuckDB and load all CSV files."""
@@ -48,11 +63,21 @@ def _init_db() -> duckdb.DuckDBPyConnection:
         # Read CSV with pandas first for reliable type handling
         df = pd.read_csv(str(csv_path))
 
-        # For signal_events, parse the JSON payload column
+        select = "SELECT * FROM df"
+
+        # For signal_events, store the payload as native JSON — validated once
+        # here, with malformed payloads kept as NULL, so readers skip json_valid
         if table == "signal_events" and "payload_json" in df.columns:
             df["payload_json"] = df["payload_json"].fillna("{}")
-
-        conn.execute(f"CREATE TABLE {table} AS SELECT * FROM df")
+            select = (
+                "SELECT * REPLACE (CASE WHEN json_valid(payload_json) "
+                "THEN payload_json::JSON END AS payload_json) FROM df"
+            )
+
+        order_by = _CLUSTER_BY.get(table)
+        if order_by:
+            select += f" ORDER BY {order_by}"
+        conn.execute(f"CREATE TABLE {table} AS {select}")
         print(f"  [data_service] Loaded {table}: {len(df)} rows")
 
     return conn
@@ -62,43 +87,60 @@ def get_db() -> duckdb.DuckDBPyConnection:
     """Return the singleton DuckDB connection, initializing if needed."""
     global _conn
     if _conn is None:
-        print("[data_service] Initializing DuckDB...")
-        _conn = _init_db()
-        print("[data_service] DuckDB ready.")
+        with _query_lock:
+            if _conn is None:
+                print("[data_service] Initializing DuckDB...")
+                _conn = _init_db()
+                print("[data_service] DuckDB ready.")
     return _conn
 
 
 def reset_db() -> None:
     """Force re-initialization (used by demo reset)."""
     global _conn
-    if _conn is not None:
-        _conn.close()
-    _conn = None
+    with _query_lock:
+        conn, _conn = _conn, None
+        if conn is not None:
+            conn.close()
 
 
-def query_df(sql: str) -> pd.DataFrame:
-    """Execute SQL and return a pandas DataFrame."""
-    conn = get_db()
+def query_df(sql: str, params: list[Any] | None = None) -> pd.DataFrame:
+    """Execute SQL (with optional ? parameters) and return a pandas DataFrame."""
     try:
-        return conn.execute(sql).fetchdf()
+        with _query_lock:
+            return get_db().execute(sql, params).fetchdf()
     except Exception as e:
         print(f"  [data_service] SQL error: {e}")
         return pd.DataFrame()
 
 
-def query_rows(sql: str) -> list[dict[str, Any]]:
-    """Execute SQL and return a list of dicts."""
-    df = query_df(sql)
+def query_rows(sql: str, params: list[Any] | None = None) -> list[dict[str, Any]]:
+    """Execute SQL (with optional ? parameters) and return a list of dicts."""
+    df = query_df(sql, params)
     if df.empty:
         return []
     return df.to_dict(orient="records")
 
 
+def query_tuples(sql: str, params: list[Any] | None = None) -> list[tuple[Any, ...]]:
+    """Execute SQL and return rows as plain tuples in SELECT order.
+
+    Skips the pandas round-trip of query_rows for hot paths that walk every
+    row and unpack a handful of columns positionally.
+    """
+    try:
+        with _query_lock:
+            return get_db().execute(sql, params).fetchall()
+    except Exception as e:
+        print(f"  [data_service] SQL error: {e}")
+        return []
+
+
 def query_scalar(sql: str, default: Any = None) -> Any:
     """Execute SQL and return a single scalar value."""
-    conn = get_db()
     try:
-        result = conn.execute(sql).fetchone()
+        with _query_lock:
+            result = get_db().execute(sql).fetchone()
         return result[0] if result else default
     except Exception as e:
         print(f"  [data_service] SQL error: {e}")
@@ -107,9 +149,9 @@ def query_scalar(sql: str, default: Any = None) -> Any:
 
 def get_loaded_tables() -> list[str]:
     """Return list of tables currently loaded in DuckDB."""
-    conn = get_db()
     try:
-        result = conn.execute("SHOW TABLES").fetchdf()
+        with _query_lock:
+            result = get_db().execute("SHOW TABLES").fetchdf()
         return result["name"].tolist() if not result.empty else []
     except Exception:
         return []
@@ -117,9 +159,9 @@ def get_loaded_tables() -> list[str]:
 
 def get_table_info(table: str) -> list[dict[str, str]]:
     """Return column names and types for a table."""
-    conn = get_db()
     try:
-        result = conn.execute(f"DESCRIBE {table}").fetchdf()
+        with _query_lock:
+            result = get_db().execute(f"DESCRIBE {table}").fetchdf()
         return result.to_dict(orient="records")
     except Exception:
         return []
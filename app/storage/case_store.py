@@ -62,6 +62,23 @@ def get_cases_by_run(run_id: str) -> list[TriageCase]:
     return [_row_to_case(r) for r in rows]
 
 
+def get_cases_by_runs(run_ids: list[str]) -> dict[str, list[TriageCase]]:
+    """Return cases for several runs from one query, grouped by run_id."""
+    grouped: dict[str, list[TriageCase]] = {rid: [] for rid in run_ids}
+    if not grouped:
+        return grouped
+    conn = get_sqlite()
+    placeholders = ",".join("?" * len(grouped))
+    rows = conn.execute(
+        f"SELECT * FROM cases WHERE run_id IN ({placeholders}) ORDER BY estimated_impact DESC",
+        list(grouped),
+    ).fetchall()
+    for r in rows:
+        case = _row_to_case(r)
+        grouped[case.run_id].append(case)
+    return grouped
+
+
 def get_case(case_id: str) -> TriageCase | None:
     """Return a single case by ID."""
     conn = get_sqlite()
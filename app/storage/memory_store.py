@@ -56,6 +56,9 @@ _DEFAULTS: list[dict[str, Any]] = [
     },
 ]
 
+# key → seeded value, for comparing current memory against the baseline
+DEFAULT_VALUES: dict[str, Any] = {d["key"]: d["value"] for d in _DEFAULTS}
+
 
 def _seed_defaults_if_empty() -> None:
     """Insert default memory entries if the table is empty."""
@@ -83,6 +86,14 @@ def get_memory(key: str) -> Any:
     return json.loads(row["value"])
 
 
+def get_memory_snapshot() -> dict[str, Any]:
+    """Return all memory values as {key: value} from a single query, newest first."""
+    _seed_defaults_if_empty()
+    conn = get_sqlite()
+    rows = conn.execute("SELECT key, value FROM memory ORDER BY updated_at DESC").fetchall()
+    return {r["key"]: json.loads(r["value"]) for r in rows}
+
+
 def get_memory_entry(key: str) -> MemoryEntry | None:
     """Get full memory entry by key."""
     _seed_defaults_if_empty()
@@ -92,12 +92,76 @@ class TestLightdashAdapter:
         assert config["chart_type"] == "bar"
         assert config["metric"] == "monthly_revenue"
 
+    def test_find_related_metrics_matches_name_table_description(self):
+        names = [m["name"] for m in self.adapter.find_related_metrics("Refund")]
+        assert "refund_count" in names
+        assert "monthly_revenue" not in names
+        assert set(self.adapter.find_related_metrics("refunds")[0]) == {"name", "label", "description"}
+
+    def test_find_related_metrics_empty_entity(self):
+        assert self.adapter.find_related_metrics("") == []
+
+    def test_find_related_metrics_returns_copies(self):
+        self.adapter.find_related_metrics("refunds")[0]["label"] = "changed"
+        assert self.adapter.find_related_metrics("refunds")[0]["label"] != "changed"
+
     def test_fetch_signals_returns_list(self):
         signals = self.adapter.fetch_signals()
         assert isinstance(signals, list)
         for s in signals:
             assert isinstance(s, SignalEvent)
 
+    def test_query_metric_is_cached(self):
+        with patch("app.services.data_service.query_rows", return_value=[{"cnt": 11}]) as q:
+            first = self.adapter.query_metric("refund_count")
+            second = self.adapter.query_metric("refund_count")
+        assert first == second
+        assert first["result"] == [{"cnt": 11}]
+        assert q.call_count == 1
+
+    def test_query_metric_concurrent_misses_share_one_query(self):
+        import threading
+        release = threading.Event()
+
+        def slow_query(sql, params=None):
+            release.wait(timeout=5)
+            return [{"cnt": 11}]
+
+        with patch("app.services.data_service.query_rows", side_effect=slow_query) as q:
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(self.adapter.query_metric("refund_count")))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            release.set()
+            for t in threads:
+                t.join()
+        assert q.call_count == 1
+        assert len(results) == 4
+        assert all(r["result"] == [{"cnt": 11}] for r in results)
+        assert len(self.adapter.get_call_log()) == 4
+
+    def test_current_month_metrics_sum_this_months_rows(self):
+        from app.services.data_service import get_db
+        db = get_db()
+        now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        db.execute(
+            "INSERT INTO invoices VALUES ('INV-T1', 'C001', ?, 123.0, 123.0, 'pro', 'paid'),"
+            " ('INV-T2', 'C001', '2020-01-01 10:00:00', 999.0, 999.0, 'pro', 'paid')",
+            [now],
+        )
+        db.execute("INSERT INTO refunds VALUES ('REF-T1', 'C001', ?, 45.0, 'test', 'stripe', 'PAY001')", [now])
+        try:
+            revenue = self.adapter.query_metric("monthly_revenue")
+            refunds = self.adapter.query_metric("total_refunds")
+        finally:
+            db.execute("DELETE FROM invoices WHERE invoice_id LIKE 'INV-T%'")
+            db.execute("DELETE FROM refunds WHERE refund_id = 'REF-T1'")
+        assert revenue["result"] == [{"sum(billed_amount)": 123.0}]
+        assert refunds["result"] == [{"sum(amount)": 45.0}]
+
     def test_reset_clears_state(self):
         self.adapter.get_metric_definitions()
         self.adapter.reset()
@@ -181,6 +245,11 @@ class TestAiriaAdapter:
         assert len(self.adapter.get_actions()) == 0
         assert len(self.adapter.get_call_log()) == 0
 
+    def test_logs_are_bounded(self):
+        from app.config import settings
+        assert self.adapter._call_log.maxlen == settings.adapter_log_max_entries
+        assert self.adapter._actions_created.maxlen == settings.adapter_log_max_entries
+
 
 # ---------------------------------------------------------------------------
 # Modulate Adapter (Sentiment Engine)
@@ -238,6 +307,19 @@ class TestModulateAdapter:
         assert "timestamp" in log[0]
         assert "provider" in log[0]
 
+    def test_polarity_to_risk_boundaries(self):
+        to_risk = self.adapter._polarity_to_risk
+        assert to_risk(-0.6) == "high"
+        assert to_risk(-0.5) == "elevated"
+        assert to_risk(-0.2) == "neutral"
+        assert to_risk(0.2) == "low"
+        assert to_risk(-0.4, "duplicate_refund") == "high"
+        assert to_risk(-0.15, "refund_spike") == "elevated"
+
+    def test_analysis_log_is_bounded(self):
+        from app.config import settings
+        assert self.adapter._analysis_log.maxlen == settings.adapter_log_max_entries
+
     def test_reset_clears_state(self):
         self.adapter.analyze_text("Test")
         self.adapter.reset()
@@ -259,6 +341,16 @@ class TestLLMClient:
         result = self.client.is_available()
         assert isinstance(result, bool)
 
+    def test_is_available_resolved_once_until_reset(self):
+        with patch.object(self.client.settings, "groq_api_key", "k"):
+            assert self.client.is_available() is True
+            with patch.object(self.client.settings, "groq_api_key", ""), \
+                 patch.object(self.client.settings, "openai_api_key", ""):
+                assert self.client.is_available() is True
+                self.client.reset()
+                assert self.client.is_available() is False
+        self.client.reset()
+
     def test_get_provider(self):
         provider = self.client.get_provider()
         assert provider in ("groq", "openai", "none")
@@ -275,6 +367,110 @@ class TestLLMClient:
         assert "call_count" in status
         assert "reasoning_steps" in status
 
+    def test_http_client_is_shared(self):
+        assert self.client._get_client() is self.client._get_client()
+
+    def test_chat_caches_identical_prompts(self):
+        messages = [{"role": "user", "content": "Explain the refund spike"}]
+        with patch.object(self.client, "is_available", return_value=True), \
+                patch.object(self.client, "get_provider", return_value="groq"), \
+                patch.object(self.client, "_call_groq", return_value="It spiked.") as call:
+            first = self.client.chat(messages, purpose="test")
+            second = self.client.chat(messages, purpose="test")
+        assert first == second == "It spiked."
+        assert call.call_count == 1
+        assert self.client.cache_stats()["hits"] == 1
+
+    def test_chat_cache_hit_is_logged(self):
+        messages = [{"role": "user", "content": "Explain the refund spike"}]
+        self.client._cache_put(
+            self.client._cache_key("groq", "fast", messages, 500), "It spiked.",
+        )
+        with patch.object(self.client, "is_available", return_value=True), \
+                patch.object(self.client, "get_provider", return_value="groq"):
+            assert self.client.chat(messages, purpose="test", tier="fast") == "It spiked."
+        log = self.client.get_reasoning_log()
+        assert [(e["provider"], e["purpose"]) for e in log] == [("cache", "test")]
+        assert log[0]["model"] == self.client.get_model("fast")
+        assert self.client.get_status()["call_count"] == 0
+        assert self.client.cache_stats()["hits"] == 1
+
+    def test_chat_does_not_cache_failures(self):
+        messages = [{"role": "user", "content": "Explain the refund spike"}]
+        with patch.object(self.client, "is_available", return_value=True), \
+                patch.object(self.client, "get_provider", return_value="groq"), \
+                patch.object(self.client, "_call_groq", return_value="") as call:
+            self.client.chat(messages)
+            self.client.chat(messages)
+        assert call.call_count == 2
+
+    def test_chat_fast_tier_uses_small_model(self):
+        messages = [{"role": "user", "content": "Summarize"}]
+        settings = self.client.settings
+        with patch.object(settings, "groq_api_key", "k"), \
+                patch.object(self.client, "_post_with_retry") as post:
+            post.return_value.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+            assert self.client.chat(messages, tier="fast") == "ok"
+            self.client.reset()
+        assert post.call_args.kwargs["payload"]["model"] == settings.groq_fast_model
+
+    def test_reasoning_log_records_tier_model(self):
+        messages = [{"role": "user", "content": "Summarize"}]
+        settings = self.client.settings
+        with patch.object(settings, "groq_api_key", "k"), \
+                patch.object(self.client, "_post_with_retry") as post:
+            post.return_value.content = b'{"choices": [{"message": {"content": "ok"}}]}'
+            self.client.chat(messages, tier="fast")
+            self.client.chat(messages + [{"role": "user", "content": "more"}])
+            log = self.client.get_reasoning_log()
+            self.client.reset()
+        assert [e["model"] for e in log] == [settings.groq_fast_model, settings.groq_model]
+
+    def test_post_retries_rate_limit(self):
+        import httpx
+        request = httpx.Request("POST", "https://example.test")
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0"}, request=request),
+            httpx.Response(503, request=request),
+            httpx.Response(200, json={"ok": True}, request=request),
+        ]
+        client = MagicMock()
+        client.post.side_effect = responses
+        with patch.object(self.client, "_get_client", return_value=client), \
+                patch.object(self.client.time, "sleep") as sleep:
+            resp = self.client._post_with_retry("https://example.test", {}, {}, timeout=1.0)
+        assert resp.status_code == 200
+        assert client.post.call_count == 3
+        assert sleep.call_count == 2
+        assert self.client.get_status()["retries"] == 2
+
+    def test_post_gives_up_after_max_attempts(self):
+        import httpx
+        from app.config import settings
+        request = httpx.Request("POST", "https://example.test")
+        client = MagicMock()
+        client.post.return_value = httpx.Response(500, request=request)
+        with patch.object(self.client, "_get_client", return_value=client), \
+                patch.object(self.client.time, "sleep"):
+            with pytest.raises(httpx.HTTPStatusError):
+                self.client._post_with_retry("https://example.test", {}, {}, timeout=1.0)
+        assert client.post.call_count == settings.llm_max_attempts
+
+    def test_warmup_skipped_when_unavailable(self):
+        with patch.object(self.client, "is_available", return_value=False), \
+                patch.object(self.client, "_get_client") as get_client:
+            self.client.warmup()
+        get_client.assert_not_called()
+
+    def test_warmup_ignores_errors(self):
+        client = MagicMock()
+        client.head.side_effect = OSError("offline")
+        with patch.object(self.client, "is_available", return_value=True), \
+                patch.object(self.client, "get_provider", return_value="groq"), \
+                patch.object(self.client, "_get_client", return_value=client):
+            self.client.warmup()
+        client.head.assert_called_once()
+
     def test_template_explain_fallback(self):
         explanation = self.client._template_explain(
             "Duplicate Refund: C003",
@@ -1,7 +1,8 @@
-"""Tests for agents — triage, monitor."""
+"""Tests for agents — triage, monitor, analyst, evaluator, memory, orchestrator."""
 
 import pytest
 from datetime import datetime
+from unittest.mock import patch
 
 from app.models.schemas import SignalEvent, Severity, TriageCase
 
@@ -162,3 +163,210 @@ class TestTriageAgent:
         title = _generate_title(anomaly)
         assert "EMEA" in title
         assert "Refund Spike" in title
+
+
+# ---------------------------------------------------------------------------
+# Analyst Agent
+# ---------------------------------------------------------------------------
+
+class TestAnalystAgent:
+    def test_ask_uses_rewrite_and_follow_ups(self):
+        from app.agents import analyst_agent
+        with patch.object(analyst_agent, "rewrite_answer", return_value="Rewritten.") as rewrite, \
+                patch.object(analyst_agent, "generate_follow_ups", return_value=["Next?"]) as follow:
+            response = analyst_agent.ask("What is total revenue?")
+        assert response.answer == "Rewritten."
+        assert response.follow_ups == ["Next?"]
+        raw_answer = rewrite.call_args.args[0]
+        follow.assert_called_once_with("What is total revenue?", raw_answer)
+
+
+# ---------------------------------------------------------------------------
+# Evaluator Agent
+# ---------------------------------------------------------------------------
+
+class TestEvaluatorAgent:
+    def _make_case(self, case_id, **kwargs):
+        from app.models.schemas import Confidence
+        return TriageCase(
+            case_id=case_id,
+            run_id="RUN-eval",
+            title=f"Case {case_id}",
+            anomaly_type="underbilling",
+            severity=Severity.medium,
+            confidence=Confidence.high,
+            **kwargs,
+        )
+
+    def test_evaluate_run_heuristic_scores(self):
+        from app.agents import evaluator_agent
+        cases = [
+            self._make_case("CASE-A", recommended_action="Fix", estimated_impact=500.0,
+                            evidence=["one", "two", "three"]),
+            self._make_case("CASE-B", evidence=["one"]),
+        ]
+        with patch.object(evaluator_agent, "get_cases_by_run", return_value=cases), \
+                patch.object(evaluator_agent, "get_false_positive_case_ids", return_value=["CASE-A"]), \
+                patch.object(evaluator_agent, "get_feedback_counts", return_value={}), \
+                patch.object(evaluator_agent, "save_eval", side_effect=lambda score: score), \
+                patch.object(evaluator_agent, "llm_available", return_value=False):
+            score = evaluator_agent.evaluate_run("RUN-eval")
+        assert score.total_cases == 2
+        assert score.false_positive_count == 1
+        assert (score.actionability, score.correctness, score.specificity) == (2, 2, 2)
+        assert "1/2 cases marked as false positives" in score.calibration_note
+        assert "1 high-confidence cases were false positives" in score.calibration_note
+
+    def test_evaluate_runs_scores_each_run(self):
+        from app.agents import evaluator_agent
+        cases_by_run = {
+            "RUN-1": [self._make_case("CASE-A", recommended_action="Fix", evidence=["one", "two"])],
+            "RUN-2": [],
+        }
+        with patch.object(evaluator_agent, "get_cases_by_runs", return_value=cases_by_run) as load, \
+                patch.object(evaluator_agent, "get_false_positive_case_ids", return_value=[]) as fps, \
+                patch.object(evaluator_agent, "get_feedback_counts", return_value={}), \
+                patch.object(evaluator_agent, "save_eval", side_effect=lambda score: score), \
+                patch.object(evaluator_agent, "llm_available", return_value=False):
+            scores = evaluator_agent.evaluate_runs(["RUN-1", "RUN-2"])
+        assert [s.run_id for s in scores] == ["RUN-1", "RUN-2"]
+        assert [s.total_cases for s in scores] == [1, 0]
+        assert scores[0].actionability == 5
+        assert load.call_count == 1
+        assert fps.call_count == 1
+
+    def test_evaluate_runs_empty(self):
+        from app.agents import evaluator_agent
+        assert evaluator_agent.evaluate_runs([]) == []
+
+
+# ---------------------------------------------------------------------------
+# Memory Agent
+# ---------------------------------------------------------------------------
+
+class TestMemoryAgent:
+    def _process_false_positive(self, anomaly_type, mem):
+        from app.agents import memory_agent
+        from app.models.schemas import Confidence, FeedbackItem, FeedbackType, MemoryEntry
+        case = TriageCase(
+            case_id="CASE-MEM", run_id="RUN-mem", title="t", anomaly_type=anomaly_type,
+            severity=Severity.medium, confidence=Confidence.medium,
+        )
+        feedback = FeedbackItem(target_type="case", target_id="CASE-MEM",
+                                feedback_type=FeedbackType.false_positive)
+        with patch.object(memory_agent, "get_case", return_value=case), \
+                patch.object(memory_agent, "set_memory",
+                             side_effect=lambda key, value, reason="", source="": MemoryEntry(
+                                 key=key, value=value, reason=reason, source=source)):
+            return memory_agent._process_case_feedback(feedback, "", mem)
+
+    def test_false_positive_raises_type_threshold(self):
+        updates = self._process_false_positive("underbilling", {"underbilling_threshold": 35.0})
+        by_key = {u.key: u for u in updates}
+        assert by_key["false_positive_penalty"].value == 0.15
+        assert by_key["underbilling_threshold"].value == 60.0
+        assert by_key["underbilling_threshold"].reason.startswith("Raised from $35.0 to $60.0")
+
+    def test_false_positive_narrows_duplicate_window_from_default(self):
+        updates = self._process_false_positive("duplicate_refund", {})
+        window = next(u for u in updates if u.key == "duplicate_refund_window_hours")
+        assert window.value == 1.5
+        assert window.reason.startswith("Narrowed from 2h to 1.5h")
+
+    def test_false_positive_unknown_type_only_adjusts_penalty(self):
+        updates = self._process_false_positive("something_else", {})
+        assert [u.key for u in updates] == ["false_positive_penalty"]
+
+    def test_improvement_summary_notes_moved_thresholds(self):
+        from app.agents import memory_agent
+        from app.models.schemas import MemoryEntry
+        entries = [
+            MemoryEntry(key="underbilling_threshold", value=35.0, reason="fp", source="feedback"),
+            MemoryEntry(key="refund_spike_multiplier", value=2.0, reason="default", source="system_default"),
+        ]
+        with patch.object(memory_agent, "get_all_memory", return_value=entries), \
+                patch.object(memory_agent, "get_false_positive_case_ids", return_value=[]), \
+                patch.object(memory_agent, "llm_available", return_value=False):
+            summary = memory_agent.get_improvement_summary()
+        assert [c["key"] for c in summary["changes"]] == ["underbilling_threshold"]
+        assert summary["improvement_notes"] == ["Underbilling threshold raised from $10.0 to $35.0"]
+
+    def test_improvement_summary_without_changes_skips_llm(self):
+        from app.agents import memory_agent
+        with patch.object(memory_agent, "get_all_memory", return_value=[]), \
+                patch.object(memory_agent, "get_false_positive_case_ids", return_value=[]), \
+                patch.object(memory_agent, "llm_available", return_value=True), \
+                patch.object(memory_agent, "_llm_summarize_learning") as summarize:
+            summary = memory_agent.get_improvement_summary()
+        summarize.assert_not_called()
+        assert summary["llm_summary"] == memory_agent._NO_CHANGES_SUMMARY
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator
+# ---------------------------------------------------------------------------
+
+class TestOrchestrator:
+    def test_run_autonomous_wires_llm_steps(self):
+        from app.agents import orchestrator
+        signal = SignalEvent(
+            signal_id="SIG-ORCH",
+            timestamp=datetime.utcnow(),
+            signal_type="anomaly_alert",
+            severity=Severity.high,
+            source="internal",
+            related_entity="refunds",
+        )
+        with patch.object(orchestrator, "_llm_analyze_signals", return_value="analysis"), \
+                patch.object(orchestrator, "_llm_synthesize_cases", return_value="summary") as synth, \
+                patch.object(orchestrator, "_llm_decide_actions", return_value="decision"), \
+                patch.object(orchestrator, "run_triage", return_value=[]), \
+                patch.object(orchestrator, "clear_cases"), \
+                patch.object(orchestrator, "save_trace"):
+            result = orchestrator.run_autonomous(signal)
+        assert result.reasoning_trace == {
+            "signal_analysis": "analysis",
+            "executive_summary": "summary",
+            "action_decision": "decision",
+        }
+        synth.assert_called_once_with([], signal, "analysis")
+        tools = result.trace.tools_called
+        assert len(tools) == len(set(tools))
+        assert tools.index("datadog_adapter") < tools.index("llm_client") < tools.index("airia_adapter")
+
+    def test_run_autonomous_shuts_down_llm_pool_on_failure(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from app.agents import orchestrator
+        signal = SignalEvent(
+            signal_id="SIG-ORCH",
+            timestamp=datetime.utcnow(),
+            signal_type="anomaly_alert",
+            severity=Severity.high,
+            source="internal",
+            related_entity="refunds",
+        )
+        pools = []
+
+        def make_pool(*args, **kwargs):
+            pools.append(ThreadPoolExecutor(*args, **kwargs))
+            return pools[-1]
+
+        with patch.object(orchestrator, "ThreadPoolExecutor", side_effect=make_pool), \
+                patch.object(orchestrator, "_llm_analyze_signals", return_value="analysis"), \
+                patch.object(orchestrator, "run_triage", side_effect=RuntimeError("boom")), \
+                patch.object(orchestrator, "clear_cases"):
+            with pytest.raises(RuntimeError):
+                orchestrator.run_autonomous(signal)
+        assert len(pools) == 1 and pools[0]._shutdown
+
+    def test_pack_lines_stops_at_budget(self):
+        from app.agents.orchestrator import _pack_lines
+        lines = ["x" * 39, "y" * 39, "z" * 39]  # 10 estimated tokens each
+        assert _pack_lines(lines, 25, 3) == [*lines[:2], "- ... 1 more omitted"]
+        assert _pack_lines(iter(lines), 100, 3) == lines
+        assert _pack_lines([], 100, 0) == []
+
+    def test_pack_lines_keeps_truncated_first_line(self):
+        from app.agents.orchestrator import _pack_lines
+        lines = ["x" * 39, "y" * 39, "z" * 39]
+        assert _pack_lines(lines, 5, 3) == ["x" * 20, "- ... 2 more omitted"]
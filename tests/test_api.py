@@ -153,6 +153,13 @@ class TestAnalystAPI:
         assert "chart_data" in data
         assert "follow_ups" in data
 
+    def test_metric_definitions(self):
+        resp = client.get("/analyst/metrics")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data) == 8
+        assert all("name" in m and "sql" in m for m in data)
+
 
 # ---------------------------------------------------------------------------
 # Feedback
@@ -216,6 +223,18 @@ class TestEvalAPI:
         data = resp.json()
         assert "eval" in data
 
+    def test_evaluate_runs(self):
+        resp = client.post("/eval/runs", json={"run_ids": ["RUN-none"]})
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["count"] == 1
+        assert data["evals"][0]["run_id"] == "RUN-none"
+        assert data["evals"][0]["total_cases"] == 0
+
+    def test_evaluate_runs_caps_batch_size(self):
+        resp = client.post("/eval/runs", json={"run_ids": [f"RUN-{i}" for i in range(51)]})
+        assert resp.status_code == 422
+
     def test_get_all_evals(self):
         resp = client.get("/eval/all")
         assert resp.status_code == 200
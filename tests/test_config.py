@@ -15,6 +15,15 @@ class TestConfigSettings:
         assert s.backend_host == "0.0.0.0"
         assert s.backend_port == 8000
 
+    def test_concurrency_and_log_limits_must_be_positive(self, monkeypatch):
+        from pydantic import ValidationError
+        from app.config import Settings
+        for var in ("LLM_MAX_CONCURRENCY", "LLM_MAX_ATTEMPTS", "ADAPTER_LOG_MAX_ENTRIES"):
+            monkeypatch.setenv(var, "0")
+            with pytest.raises(ValidationError):
+                Settings()
+            monkeypatch.delenv(var)
+
 
 class TestLLMConfig:
     """Test LLM provider selection logic."""
@@ -54,3 +63,4 @@ class TestLLMConfig:
         s = Settings()
         assert s.groq_model == "llama-3.3-70b-versatile"
         assert s.openai_model == "gpt-4o-mini"
+        assert s.groq_fast_model == "llama-3.1-8b-instant"
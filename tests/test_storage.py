@@ -84,6 +84,16 @@ class TestCaseStore:
             cases_other = get_cases_by_run("RUN-nonexistent")
             assert len(cases_other) == 0
 
+    def test_get_cases_by_runs_groups_by_run(self, sqlite_conn):
+        with patch("app.storage.case_store.get_sqlite", return_value=sqlite_conn):
+            from app.storage.case_store import save_case, get_cases_by_runs
+            save_case(self._make_case("CASE-A"))
+            save_case(self._make_case("CASE-B"))
+            grouped = get_cases_by_runs(["RUN-test", "RUN-nonexistent"])
+            assert sorted(c.case_id for c in grouped["RUN-test"]) == ["CASE-A", "CASE-B"]
+            assert grouped["RUN-nonexistent"] == []
+            assert get_cases_by_runs([]) == {}
+
     def test_update_case_status(self, sqlite_conn):
         with patch("app.storage.case_store.get_sqlite", return_value=sqlite_conn):
             from app.storage.case_store import save_case, update_case_status, get_case
@@ -243,6 +253,14 @@ class TestMemoryStore:
             val = get_memory("nonexistent_key")
             assert val is None
 
+    def test_get_memory_snapshot(self, sqlite_conn):
+        with patch("app.storage.memory_store.get_sqlite", return_value=sqlite_conn):
+            from app.storage.memory_store import set_memory, get_memory, get_memory_snapshot
+            set_memory("underbilling_threshold", 35.0, reason="test", source="unit_test")
+            snapshot = get_memory_snapshot()
+            assert snapshot["underbilling_threshold"] == 35.0
+            assert snapshot["false_positive_penalty"] == get_memory("false_positive_penalty")
+
 
 # ---------------------------------------------------------------------------
 # Trace Store